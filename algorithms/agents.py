@@ -1,8 +1,13 @@
+import os
 import time
+import pickle
+import threading
 from world.game import Directions, Agent
+from algorithms import utils
 import algorithms.search as search
 import algorithms.problems as problems
 import algorithms.heuristics as heuristics
+from algorithms.replanning import DStarLite
 
 
 class SearchAgent(Agent):
@@ -22,19 +27,34 @@ class SearchAgent(Agent):
         fn="tinyHouseSearch",
         prob="SimpleSurvivorProblem",
         heuristic="nullHeuristic",
+        background=False,
+        weight=None,
+        **problemArgs
     ):
         """
         fn: Name of search function (dfs, bfs, ucs, astar)
         prob: Name of problem class
         heuristic: Name of heuristic function (for A*)
+        background: plan in a background thread and start moving as soon as
+            a prefix of the plan is final (see streamingAStarSearch)
+        weight: heuristic weight for search functions that support it
+        problemArgs: Extra keyword arguments for the problem class (e.g. contract=True)
         """
         # Get the search function from the name
         if fn not in dir(search):
             raise AttributeError(fn + " is not a search function in search.py.")
         func = getattr(search, fn)
+        varnames = func.__code__.co_varnames
+        self.background = background
+        self.streaming = "onPrefix" in varnames
+        if weight is not None:
+            if "weight" not in varnames:
+                raise AttributeError(fn + " does not take a heuristic weight.")
+            unweighted = func
+            func = lambda x, **kwargs: unweighted(x, weight=weight, **kwargs)
 
         # Check if this search function uses a heuristic
-        if "heuristic" not in func.__code__.co_varnames:
+        if "heuristic" not in varnames:
             print("[SearchAgent] using function " + fn)
             self.searchFunction = func
         else:
@@ -46,12 +66,13 @@ class SearchAgent(Agent):
             else:
                 raise AttributeError(heuristic + " is not a function in heuristics.py")
             print("[SearchAgent] using function %s and heuristic %s" % (fn, heuristic))
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x, **kwargs: func(x, heuristic=heur, **kwargs)
 
         # Get the problem class
         if prob not in dir(problems):
             raise AttributeError(prob + " is not a search problem type in problems.py.")
         self.searchType = getattr(problems, prob)
+        self.problemArgs = problemArgs
         print("[SearchAgent] using problem type " + prob)
 
     def registerInitialState(self, state):
@@ -62,11 +83,21 @@ class SearchAgent(Agent):
             raise Exception("No search function provided for SearchAgent")
 
         starttime = time.time()
-        problem = self.searchType(state)  # Create the search problem
+        problemArgs = self.problemArgs
+        if self.background and "visualize" in self.searchType.__init__.__code__.co_varnames:
+            # Tk is driven by the game thread; the planner thread must not draw
+            problemArgs = dict(problemArgs, visualize=False)
+        problem = self.searchType(state, **problemArgs)  # Create the search problem
+        if getattr(problem, "reduction", None) is not None:
+            print(problem.reduction.report())
+        if self.background:
+            self._planInBackground(problem, starttime)
+            return
         self.actions = self.searchFunction(problem)  # Find path using search algorithm
 
         if self.actions is None:
             self.actions = []
+        self.actions = problem.expandActions(self.actions)  # Unpack macro actions
 
         totalCost = problem.getCostOfActions(self.actions)
         print(
@@ -75,6 +106,65 @@ class SearchAgent(Agent):
         )
         if "_expanded" in dir(problem):
             print("Search nodes expanded: %d" % problem._expanded)
+        heuristicInfo = getattr(problem, "heuristicInfo", None)
+        if heuristicInfo and hasattr(heuristicInfo, "report"):
+            print("Heuristic cache: " + heuristicInfo.report())
+
+    def _planInBackground(self, problem, starttime):
+        """
+        Runs the search in a daemon thread. Streaming search functions publish
+        every prefix of the plan that is final; other functions publish the
+        whole plan when they finish. getAction waits for the next action, and
+        re-raises the search's exception if it failed, or an error if the
+        final plan does not start with the moves already committed.
+        """
+        self.actions = []
+        self.planDone = False
+        self.planError = None  # Exception raised by the search, re-raised by getAction
+        self.planReady = threading.Condition()
+
+        def publish(prefix):
+            prefix = problem.expandActions(prefix)
+            with self.planReady:
+                if len(prefix) > len(self.actions):
+                    if not self.actions:
+                        print(
+                            "First %d committed moves ready after %.3f seconds"
+                            % (len(prefix), time.time() - starttime)
+                        )
+                    self.actions = prefix
+                    self.planReady.notify_all()
+
+        def plan():
+            kwargs = {"onPrefix": publish} if self.streaming else {}
+            actions = None
+            try:
+                actions = problem.expandActions(self.searchFunction(problem, **kwargs) or [])
+            except Exception as e:
+                self.planError = e
+            finally:
+                # Always wake getAction, even if the search failed
+                with self.planReady:
+                    if actions is not None and actions[: len(self.actions)] != self.actions:
+                        # Those moves may already have been made; never swap them for another plan
+                        self.planError = Exception(
+                            "Final plan does not extend the %d committed moves" % len(self.actions)
+                        )
+                        actions = None
+                    if actions is not None:
+                        self.actions = actions
+                    self.planDone = True
+                    self.planReady.notify_all()
+            if actions is None:
+                return
+            print(
+                "Path found with total cost of %d in %.1f seconds (background)"
+                % (problem.getCostOfActions(actions), time.time() - starttime)
+            )
+            if "_expanded" in dir(problem):
+                print("Search nodes expanded: %d" % problem._expanded)
+
+        threading.Thread(target=plan, daemon=True).start()
 
     def getAction(self, state):
         """
@@ -86,7 +176,244 @@ class SearchAgent(Agent):
         i = self.actionIndex
         self.actionIndex += 1
 
+        if self.background:
+            # Wait until the planner has committed to the move after this one
+            with self.planReady:
+                while i >= len(self.actions) and not self.planDone:
+                    self.planReady.wait()
+                if self.planError is not None:
+                    raise self.planError
+
         if i < len(self.actions):
             return self.actions[i]
         else:
             return Directions.STOP
+
+
+class ReplanningAgent(Agent):
+    """
+    Agent that keeps its plan up to date while the map changes.
+
+    It plans with D* Lite toward the nearest remaining survivor. Before every
+    move it reads the cells changed since its last move from
+    RescueState.getLayoutChanges() (fire, flooding, collapses) and repairs
+    only the affected part of its search tree, instead of replaying a fixed
+    action list like SearchAgent.
+
+    fn, prob and heuristic are accepted for command-line compatibility and
+    ignored: D* Lite searches the grid directly, so problem options
+    (-a contract=True, reduce=False, ...) are rejected.
+    """
+
+    def __init__(self, fn=None, prob=None, heuristic=None, **problemArgs):
+        if problemArgs:
+            raise ValueError(
+                "ReplanningAgent takes no problem options (got %s): D* Lite plans on the layout grid"
+                % ", ".join(sorted(problemArgs))
+            )
+        self.planner = None
+
+    def registerInitialState(self, state):
+        starttime = time.time()
+        self.planner = DStarLite(
+            state.getLayout(), state.getRescuerPosition(), state.getSurvivorsAsList()
+        )
+        expanded = self.planner.computeShortestPath()
+        self.seenChanges = len(state.getLayoutChanges())
+        print(
+            "Initial plan with cost-to-go %s in %.3f seconds (%d nodes expanded)"
+            % (self.planner.costToGo(), time.time() - starttime, expanded)
+        )
+
+    def getAction(self, state):
+        """
+        Folds the latest layout changes and rescues into the D* Lite tree,
+        then returns the first move of the repaired plan.
+        """
+        planner = self.planner
+        planner.layout = state.getLayout()
+        planner.moveTo(state.getRescuerPosition())
+        for goal in planner.goals - set(state.getSurvivorsAsList()):
+            planner.removeGoal(goal)
+
+        changes = state.getLayoutChanges()[self.seenChanges :]
+        self.seenChanges += len(changes)
+        if changes:
+            starttime = time.time()
+            for cell in changes:
+                planner.cellChanged(cell)
+            expanded = planner.computeShortestPath()
+            print(
+                "[ReplanningAgent] %d cell(s) changed: replanned in %.4f seconds (%d nodes expanded)"
+                % (len(changes), time.time() - starttime, expanded)
+            )
+
+        action = planner.nextAction()
+        if action is None:
+            return Directions.STOP
+        return action
+
+
+class RealTimeAgent(Agent):
+    """
+    Real-time heuristic search agent (RTAA*, a variant of LRTA*).
+
+    Instead of planning the whole route before moving, every getAction call
+    runs a bounded A* lookahead from the current state (at most `lookahead`
+    expansions and `timeLimit` milliseconds), raises the heuristic value of
+    every expanded state to f(best frontier state) - g(state), and commits
+    to the first move toward that frontier state. The time to the first move
+    therefore does not depend on the size of the map.
+
+    Learned heuristic values are kept per layout (fingerprint) and goal set,
+    in memory and on disk under utils.CACHE_DIR, so later missions on the
+    same building start from the improved values and converge faster.
+    """
+
+    # fingerprint -> {goal key -> {state: learned h}}, shared by all missions in this process
+    learnedTables = {}
+
+    def __init__(
+        self,
+        fn=None,
+        prob="SimpleSurvivorProblem",
+        heuristic="nullHeuristic",
+        lookahead=50,
+        timeLimit=None,
+        persist=True,
+        **problemArgs
+    ):
+        """
+        fn: ignored (the lookahead search is built in)
+        prob: Name of problem class
+        heuristic: Name of the initial heuristic function
+        lookahead: max expansions per move
+        timeLimit: max milliseconds per move (None = expansions only)
+        persist: load/save learned values from/to the disk cache
+        """
+        if heuristic in dir(heuristics):
+            self.heuristic = getattr(heuristics, heuristic)
+        else:
+            raise AttributeError(heuristic + " is not a function in heuristics.py")
+        if prob not in dir(problems):
+            raise AttributeError(prob + " is not a search problem type in problems.py.")
+        self.searchType = getattr(problems, prob)
+        self.problemArgs = problemArgs
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1 expansion per move, got %s" % (lookahead,))
+        self.lookahead = lookahead
+        self.timeLimit = timeLimit
+        self.persist = persist
+        print("[RealTimeAgent] using problem type %s and heuristic %s" % (prob, heuristic))
+
+    def registerInitialState(self, state):
+        layout = state.getLayout()
+        self.fingerprint = layout.fingerprint()
+        if self.fingerprint not in RealTimeAgent.learnedTables:
+            tables = {}
+            path = utils.cachePath("lrta", self.fingerprint)
+            if self.persist:
+                try:
+                    with open(path, "rb") as f:
+                        tables = pickle.load(f)
+                except (OSError, EOFError, pickle.UnpicklingError):
+                    pass
+            RealTimeAgent.learnedTables[self.fingerprint] = tables
+        self.moves, self.expansions, self.worstMoveTime = 0, 0, 0.0
+        self.pending = []
+        self._newProblem(state)
+        print("[RealTimeAgent] %d learned values loaded" % len(self.learned))
+
+    def _newProblem(self, state):
+        self.problem = self.searchType(state, **self.problemArgs)
+        self.current = self.problem.getStartState()
+        goals = getattr(self.problem, "goals", None)
+        key = (type(self.problem).__name__, tuple(sorted(goals)) if goals else None)
+        self.learned = RealTimeAgent.learnedTables[self.fingerprint].setdefault(key, {})
+
+    def _h(self, s):
+        value = self.learned.get(s)
+        if value is None:
+            value = self.heuristic(s, self.problem)
+        return value
+
+    def _position(self, s):
+        return s if isinstance(s[0], int) else s[0]
+
+    def getAction(self, state):
+        """
+        Runs one bounded lookahead, learns from it and returns one move.
+        """
+        if self.pending:
+            return self.pending.pop(0)
+        if self._position(self.current) != state.getRescuerPosition() or self.problem.isGoalState(self.current):
+            # Off track, or reached a goal of a multi-goal problem: retarget from here
+            self._newProblem(state)
+        if self.problem.isGoalState(self.current):
+            return Directions.STOP
+
+        starttime = time.time()
+        deadline = None if self.timeLimit is None else starttime + self.timeLimit / 1000.0
+        start = self.current
+        frontier = utils.PriorityQueue()
+        frontier.push((start, 0), self._h(start))
+        g = {start: 0}
+        parent = {}
+        closed = []
+        expanded = 0
+        best = None
+        while not frontier.isEmpty():
+            s, gs = frontier.pop()
+            if gs > g[s]:
+                continue
+            if self.problem.isGoalState(s) or expanded >= self.lookahead or (
+                deadline is not None and expanded > 0 and time.time() > deadline
+            ):
+                best = s
+                break
+            closed.append(s)
+            expanded += 1
+            for succ, action, cost in self.problem.getSuccessors(s):
+                ng = gs + cost
+                if ng < g.get(succ, float("inf")):
+                    g[succ] = ng
+                    parent[succ] = (s, action)
+                    frontier.push((succ, ng), ng + self._h(succ))
+        if best is None:
+            return Directions.STOP  # No goal reachable
+
+        # RTAA* update: every expanded state learns f(best) - g(state)
+        fBest = g[best] + self._h(best)
+        for s in closed:
+            self.learned[s] = max(self._h(s), fBest - g[s])
+
+        # Commit to the first move toward the best frontier state
+        nextState = best
+        while parent[nextState][0] != start:
+            nextState = parent[nextState][0]
+        action = parent[nextState][1]
+        self.current = nextState
+
+        moveTime = time.time() - starttime
+        self.moves += 1
+        self.expansions += expanded
+        self.worstMoveTime = max(self.worstMoveTime, moveTime)
+        self.pending = self.problem.expandActions([action])
+        return self.pending.pop(0)
+
+    def final(self, state):
+        """
+        Saves the learned heuristic values at the end of the mission.
+        """
+        print(
+            "[RealTimeAgent] %d moves, %d expansions, worst move took %.2f ms, %d learned values"
+            % (self.moves, self.expansions, self.worstMoveTime * 1000, len(self.learned))
+        )
+        if self.persist:
+            path = utils.cachePath("lrta", self.fingerprint)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    pickle.dump(RealTimeAgent.learnedTables[self.fingerprint], f)
+            except OSError as e:
+                print("Could not write cache file %s (%s)" % (path, e))
@@ -0,0 +1,88 @@
+from world.game import MOVES, MOVE_VECTORS
+
+
+def freeNeighbors(walls, pos):
+    """
+    Returns the (action, nextPos) pairs of the free cells next to pos.
+    """
+    x, y = pos
+    neighbors = []
+    for action, (dx, dy) in zip(MOVES, MOVE_VECTORS):
+        nextx, nexty = x + dx, y + dy
+        if not walls[nextx][nexty]:
+            neighbors.append((action, (nextx, nexty)))
+    return neighbors
+
+
+class CorridorGraph:
+    """
+    A compressed view of the free cells of a layout.
+
+    Every chain of corridor cells (free cells with exactly two free neighbors)
+    is collapsed into a single weighted edge between the junctions, dead ends
+    and kept cells at its ends. An edge stores the summed terrain cost of the
+    cells it enters and the tuple of primitive Directions that walks it, so a
+    plan over the contracted graph can always be expanded back to moves.
+
+    walls: Grid of walls
+    costFn: function (x,y)->cost of entering a cell
+    keep: cells that must stay as nodes (start, survivors, goal)
+    """
+
+    def __init__(self, walls, costFn, keep=()):
+        self.walls = walls
+        self.costFn = costFn
+        self.nodes = set(keep)
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if not walls[x][y] and len(freeNeighbors(walls, (x, y))) != 2:
+                    self.nodes.add((x, y))
+        self.edges = {}
+
+    def getEdges(self, node):
+        """
+        Returns the list of (target, actions, cost) edges leaving node.
+
+        Edges are built lazily so only the part of the graph the search
+        reaches is ever walked.
+        """
+        edges = self.edges.get(node)
+        if edges is None:
+            edges = [self._followCorridor(node, action, nextPos) for action, nextPos in freeNeighbors(self.walls, node)]
+            edges = [edge for edge in edges if edge is not None]
+            self.edges[node] = edges
+        return edges
+
+    def _followCorridor(self, node, action, pos):
+        """
+        Walks from node through pos until the next node is reached.
+        Returns None for corridors that loop back onto node.
+        """
+        actions = [action]
+        cost = self.costFn(pos)
+        prev = node
+        while pos not in self.nodes:
+            # Corridor cells have exactly one neighbor other than where we came from
+            for nextAction, nextPos in freeNeighbors(self.walls, pos):
+                if nextPos != prev:
+                    break
+            prev, pos = pos, nextPos
+            actions.append(nextAction)
+            cost += self.costFn(pos)
+        if pos == node:
+            return None
+        return (pos, tuple(actions), cost)
+
+
+def expandActions(actions):
+    """
+    Flattens a plan made of corridor edges (tuples of Directions) and
+    primitive Directions into a list of primitive Directions.
+    """
+    expanded = []
+    for action in actions:
+        if isinstance(action, tuple):
+            expanded.extend(action)
+        else:
+            expanded.append(action)
+    return expanded
@@ -0,0 +1,166 @@
+import numpy as np
+from algorithms.distances import SurvivorDistanceMatrix
+from algorithms.tours import heldKarpPath
+from world.game import MOVE_VECTORS
+
+
+class CutDecomposition:
+    """
+    Exact decomposition of a MultiSurvivorProblem at articulation points.
+
+    One DFS from the rescuer over the free cells of problem.walls gives the
+    usual low-link values: a child y of cell x is separated when
+    low[y] >= disc[x], i.e. subtree(y) (a "wing") is only reachable through
+    x. Any route that rescues survivors in a wing enters it through x and,
+    unless it ends there, leaves through x again, and splitting one wing
+    into several excursions never helps. So each wing is solved on its own
+    from x, twice: closed (back to x) and open (ending inside). The region
+    that contains x then treats x as one more point to visit, paying the
+    wing's closed cost, or its open cost if the route ends there. Wings
+    nest, so regions are solved bottom-up, each with Held-Karp over its own
+    survivors and attachment cells only.
+
+    A wing is only split off when there are survivors on both sides of its
+    cut cell; a corridor full of cut cells leading to one room stays whole.
+    """
+
+    def __init__(self, problem, maxMemoryMB=2048):
+        self.problem = problem
+        self.maxMemoryMB = maxMemoryMB
+        self.adjacency = problem.adjacency
+        self.start = problem.getStartState()[0]
+        self.survivors = set(problem.survivorPositions)
+        self._search()
+        self.articulationPoints = set(
+            self.parent[y] for y in self.disc if self._isSeparated(y) and self.parent[y] != self.start
+        )
+        if len(self.children[self.start]) > 1:
+            self.articulationPoints.add(self.start)
+        self.wings = 0  # Wings split off while solving
+        self.largestRegion = 0  # Most points in one Held-Karp
+
+    def _search(self):
+        """
+        Iterative DFS from the start: disc, low, parent, children and the
+        number of survivors in each subtree.
+        """
+        walls = self.problem.walls
+        start = self.start
+        self.disc = {start: 0}
+        self.low = {start: 0}
+        self.parent = {start: None}
+        self.children = {start: []}
+        self.count = {}
+        stack = [(start, self._neighbors(walls, start))]
+        while stack:
+            x, neighbors = stack[-1]
+            for y in neighbors:
+                if y not in self.disc:
+                    self.disc[y] = self.low[y] = len(self.disc)
+                    self.parent[y] = x
+                    self.children[y] = []
+                    self.children[x].append(y)
+                    stack.append((y, self._neighbors(walls, y)))
+                    break
+                if y != self.parent[x]:
+                    self.low[x] = min(self.low[x], self.disc[y])
+            else:
+                stack.pop()
+                self.count[x] = (x in self.survivors) + sum(self.count[y] for y in self.children[x])
+                if stack:
+                    p = stack[-1][0]
+                    self.low[p] = min(self.low[p], self.low[x])
+
+    def _neighbors(self, walls, pos):
+        x, y = pos
+        return iter(
+            [(x + dx, y + dy) for dx, dy in MOVE_VECTORS if not walls[x + dx][y + dy]]
+        )
+
+    def _isSeparated(self, y):
+        x = self.parent[y]
+        return x is not None and self.low[y] >= self.disc[x]
+
+    def solve(self):
+        """
+        Returns (cost, order): the cheapest rescue route's cost and the
+        survivors in the order it first reaches them, or (inf, None) if a
+        survivor is unreachable.
+        """
+        if any(s not in self.disc for s in self.survivors):
+            return np.inf, None
+        closed, closedOrder, opened, openOrder = self._solveRegion(self.start, self.start)
+        return opened, openOrder
+
+    def _solveRegion(self, root, first):
+        """
+        Solves the region made of first and its DFS subtree (plus root, the
+        cell the route starts from and returns to). Returns (closed cost,
+        closed order, open cost, open order).
+        """
+        total = self.count[first]
+        if total == 0:
+            return 0.0, [], 0.0, []
+
+        # Walk the core of the region, splitting off wings with only part of its survivors
+        core = []
+        wings = {}  # attachment cell -> [(closed, closedOrder, open, openOrder)]
+        stack = [first]
+        while stack:
+            x = stack.pop()
+            if x in self.survivors:
+                core.append(x)
+            for y in self.children[x]:
+                if self.count[y] == 0:
+                    continue
+                if self._isSeparated(y) and self.count[y] < total:
+                    self.wings += 1
+                    wings.setdefault(x, []).append(self._solveRegion(x, y))
+                else:
+                    stack.append(y)
+
+        points = list(core) + [x for x in wings if x not in core]
+        self.largestRegion = max(self.largestRegion, len(points))
+        matrix = SurvivorDistanceMatrix(self.adjacency, [root] + points)
+
+        # Each attachment costs its wings' closed tours, or one open tour if the route ends there
+        extra = np.zeros(len(points))
+        openSaving = np.zeros(len(points))
+        bestOpen = {}
+        for j, x in enumerate(points):
+            for i, (closed, closedOrder, opened, openOrder) in enumerate(wings.get(x, [])):
+                extra[j] += closed
+                if closed - opened > openSaving[j]:
+                    openSaving[j] = closed - opened
+                    bestOpen[x] = i
+
+        back = matrix.dist[1:, 0]
+        closedCost, closedPoints = heldKarpPath(matrix.dist, back, self.maxMemoryMB)
+        openCost, openPoints = heldKarpPath(matrix.dist, -openSaving, self.maxMemoryMB)
+        if closedPoints is None or openPoints is None:
+            return np.inf, None, np.inf, None
+        return (
+            closedCost + extra.sum(),
+            self._expand(points, wings, closedPoints, None),
+            openCost + extra.sum(),
+            self._expand(points, wings, openPoints, bestOpen.get(points[openPoints[-1]])),
+        )
+
+    def _expand(self, points, wings, order, lastOpen):
+        """
+        Survivor order of a region route visiting points in order; the last
+        point's wing number lastOpen (if any) is done last and left open.
+        """
+        survivors = []
+        for n, j in enumerate(order):
+            x = points[j]
+            if x in self.survivors:
+                survivors.append(x)
+            attached = wings.get(x, [])
+            openIndex = lastOpen if n == len(order) - 1 else None
+            for i, (closed, closedOrder, opened, openOrder) in enumerate(attached):
+                if i != openIndex:
+                    survivors.extend(closedOrder)
+            if openIndex is not None:
+                survivors.extend(attached[openIndex][3])
+        return survivors
@@ -0,0 +1,460 @@
+import heapq
+import numpy as np
+from algorithms import utils
+from world.game import MOVES, MOVE_VECTORS
+
+# Policy arrays store indices in MOVES (-1 = no action: goal, wall or unreachable)
+
+
+class CostToGoField:
+    """
+    Terrain-weighted distance from every cell to the nearest of a set of goals.
+
+    dist[x, y] is the cheapest cost of walking from (x, y) to a goal (the cost
+    of a move is the terrain cost of the cell entered), np.inf for walls and
+    unreachable cells. policy[x, y] is the index in MOVES of the first move
+    of such a cheapest walk. Both are computed by one reverse Dijkstra seeded
+    with every goal at 0, so any later query is just a walk down the policy.
+    """
+
+    def __init__(self, walls, costFn, goals):
+        """
+        walls: Grid of walls
+        costFn: function (x,y)->cost of entering a cell
+        goals: list of goal cells
+        """
+        width, height = walls.width, walls.height
+        self.walls = walls
+        self.goals = list(goals)
+        self.reduced = False  # Whether walls are the layout's reduced walls (set by getCostToGo)
+        dist = [float("inf")] * (width * height)
+        policy = [-1] * (width * height)
+
+        heap = []
+        for x, y in self.goals:
+            dist[x * height + y] = 0
+            heap.append((0, x, y))
+        heapq.heapify(heap)
+
+        while heap:
+            d, x, y = heapq.heappop(heap)
+            if d > dist[x * height + y]:
+                continue
+            enterCost = costFn((x, y))
+            # Relax the reverse edges: a neighbor reaches (x, y) by moving back toward it
+            for code, (dx, dy) in enumerate(MOVE_VECTORS):
+                prevx, prevy = x - dx, y - dy
+                if walls[prevx][prevy]:
+                    continue
+                nd = d + enterCost
+                i = prevx * height + prevy
+                if nd < dist[i]:
+                    dist[i] = nd
+                    policy[i] = code
+                    heapq.heappush(heap, (nd, prevx, prevy))
+
+        self.dist = np.array(dist, dtype=np.float64).reshape(width, height)
+        self.policy = np.array(policy, dtype=np.int8).reshape(width, height)
+
+    def repaired(self, layout, changes):
+        """
+        Returns a copy of this field that is valid for layout, a newer
+        version of the layout it was computed on, where the cells in changes
+        were edited. Used by RescueLayout to carry cached fields over edits.
+
+        Only the affected part is recomputed (dynamic SSSP): the cells whose
+        policy walks through a changed cell are reset and re-seeded from
+        their unaffected neighbors, then a Dijkstra from them also lowers any
+        cell that a cheaper or newly opened cell now serves better.
+        """
+        walls = layout.getReduction().prunedWalls if self.reduced else layout.walls
+        height = walls.height
+        changed = set(changes)
+        if walls is not self.walls:
+            # The reduction may have opened or filled more cells than were edited
+            for x in range(walls.width):
+                if walls.data[x] != self.walls.data[x]:
+                    changed.update((x, y) for y in range(height) if walls[x][y] != self.walls[x][y])
+
+        dist = self.dist.copy()
+        policy = self.policy.copy()
+
+        # Cells whose cheapest walk goes through a changed cell
+        affected = set()
+        stack = list(changed)
+        while stack:
+            pos = stack.pop()
+            if pos in affected:
+                continue
+            affected.add(pos)
+            x, y = pos
+            for dx, dy in MOVE_VECTORS:
+                prevx, prevy = x - dx, y - dy
+                if 0 <= prevx < walls.width and 0 <= prevy < height:
+                    code = policy[prevx, prevy]
+                    if code >= 0 and MOVE_VECTORS[code] == (dx, dy):
+                        stack.append((prevx, prevy))
+
+        for x, y in affected:
+            dist[x, y] = np.inf
+            policy[x, y] = -1
+        heap = []
+        # Goals are seeded exactly as in __init__, walls or not
+        for x, y in self.goals:
+            if (x, y) in affected:
+                dist[x, y] = 0
+                heap.append((0, x, y))
+
+        # Seed affected cells from their unaffected neighbors
+        for x, y in affected:
+            if walls[x][y] or dist[x, y] == 0:
+                continue
+            for code, (dx, dy) in enumerate(MOVE_VECTORS):
+                nextx, nexty = x + dx, y + dy
+                if walls[nextx][nexty] or (nextx, nexty) in affected:
+                    continue
+                nd = dist[nextx, nexty] + layout.getTerrainCost(nextx, nexty)
+                if nd < dist[x, y]:
+                    dist[x, y] = nd
+                    policy[x, y] = code
+            if dist[x, y] < np.inf:
+                heap.append((float(dist[x, y]), x, y))
+        heapq.heapify(heap)
+
+        while heap:
+            d, x, y = heapq.heappop(heap)
+            if d > dist[x, y]:
+                continue
+            enterCost = layout.getTerrainCost(x, y)
+            for code, (dx, dy) in enumerate(MOVE_VECTORS):
+                prevx, prevy = x - dx, y - dy
+                if walls[prevx][prevy]:
+                    continue
+                nd = d + enterCost
+                if nd < dist[prevx, prevy]:
+                    dist[prevx, prevy] = nd
+                    policy[prevx, prevy] = code
+                    heapq.heappush(heap, (nd, prevx, prevy))
+
+        field = CostToGoField.__new__(CostToGoField)
+        field.walls = walls
+        field.goals = self.goals
+        field.reduced = self.reduced
+        field.dist = dist
+        field.policy = policy
+        field.repairedCells = len(affected)
+        return field
+
+    def distance(self, pos):
+        return float(self.dist[pos[0], pos[1]])
+
+    def plan(self, start):
+        """
+        Returns the list of Directions from start to the nearest goal by
+        following the policy, or None if no goal is reachable.
+        """
+        if self.dist[start[0], start[1]] == np.inf:
+            return None
+        x, y = start
+        actions = []
+        while True:
+            code = self.policy[x, y]
+            if code < 0:
+                return actions
+            dx, dy = MOVE_VECTORS[code]
+            x, y = x + dx, y + dy
+            actions.append(MOVES[code])
+
+
+def getCostToGo(problem, goals=None):
+    """
+    Returns the CostToGoField toward goals (default: problem.goals) for a
+    SimpleSurvivorProblem, computed once and cached in problem.heuristicInfo.
+    With default terrain costs the field is also cached on the layout, so
+    problems built from other start positions reuse it.
+    """
+    if goals is None:
+        goals = problem.goals
+    key = ("costToGo", tuple(sorted(goals)))
+    field = problem.heuristicInfo.get(key)
+    if field is None:
+        if problem.terrainCosts:
+            layoutKey = key + (problem.reduction is not None,)
+            field = problem.layout._cache.get(layoutKey)
+            if field is None:
+                field = CostToGoField(problem.walls, problem.costFn, goals)
+                field.reduced = problem.reduction is not None
+                problem.layout._cache[layoutKey] = field
+        else:
+            field = CostToGoField(problem.walls, problem.costFn, goals)
+        problem.heuristicInfo.pin(key, field)
+    return field
+
+
+class SurvivorDistanceMatrix:
+    """
+    Terrain-weighted maze distances between the rescuer start and every
+    survivor of a MultiSurvivorProblem.
+
+    points[0] is the start and points[1:] are the survivors in the order of
+    problem.survivorPositions (point i + 1 is survivor bit i). dist[i, j] is
+    the cheapest cost of walking from points[i] to points[j] (np.inf if
+    unreachable) and paths[i][j] the Directions of such a walk (None if
+    unreachable). Moves cost the cell entered, so dist is not symmetric.
+
+    Built with one Dijkstra per point over the problem's adjacency table,
+    each stopping as soon as every other point is settled. dist is a
+    read-only array and paths are tuples, so the matrix can be shared.
+    """
+
+    def __init__(self, adjacency, points):
+        """
+        adjacency: LayoutAdjacency of the walls being searched
+        points: start followed by the survivor positions
+        """
+        self.points = tuple(points)
+        self.adjacency = adjacency
+        self.reduced = False  # Whether adjacency is the layout's reduced one (set by getSurvivorDistances)
+        self.settled = 0  # Cells settled over all the Dijkstras
+        rows = [self._searchFrom(i) for i in range(len(self.points))]
+        self._store(rows)
+
+    def _searchFrom(self, i):
+        """
+        Dijkstra from points[i] over self.adjacency, stopping once every
+        point is settled. Returns the (costs, paths) row of point i.
+        """
+        adjacency = self.adjacency
+        size = len(self.points)
+        costs = [np.inf] * size
+        row = [None] * size
+        targetIndex = {}
+        for j, pos in enumerate(self.points):
+            targetIndex.setdefault(adjacency.index(pos), []).append(j)
+
+        sourceIndex = adjacency.index(self.points[i])
+        best = {sourceIndex: 0}
+        parent = {sourceIndex: None}
+        done = set()
+        remaining = len(targetIndex)
+        heap = [(0, sourceIndex)]
+        while heap and remaining:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            self.settled += 1
+            if u in targetIndex:
+                remaining -= 1
+                for j in targetIndex[u]:
+                    costs[j] = d
+                    row[j] = self._walkBack(adjacency, parent, u)
+            for e in range(adjacency.offsets[u], adjacency.offsets[u + 1]):
+                v = adjacency.targets[e]
+                nd = d + adjacency.costs[e]
+                if nd < best.get(v, np.inf):
+                    best[v] = nd
+                    parent[v] = (u, e)
+                    heapq.heappush(heap, (nd, v))
+        return costs, tuple(row)
+
+    def _store(self, rows):
+        dist = np.array([costs for costs, paths in rows], dtype=np.float64).reshape(len(rows), len(rows))
+        dist.setflags(write=False)
+        self.dist = dist
+        self.paths = tuple(paths for costs, paths in rows)
+
+    def repaired(self, layout, changes):
+        """
+        Returns a copy of this matrix that is valid for layout, a newer
+        version of the layout it was computed on, where the cells in changes
+        were edited. Used by RescueLayout to carry cached matrices over edits.
+
+        If no changed cell got cheaper to enter (new walls, worse terrain),
+        only the points whose stored paths enter a changed cell are searched
+        again: every other path kept its cost and nothing got cheaper. A
+        cheaper or newly opened cell can shorten any path, so then every
+        point is searched again on the new adjacency.
+        """
+        adjacency = layout.getAdjacency(self.reduced)
+        old = self.adjacency
+        changed = set(changes)
+        if adjacency.walls is not old.walls:
+            # The reduction may have opened or filled more cells than were edited
+            for x in range(adjacency.width):
+                if adjacency.walls.data[x] != old.walls.data[x]:
+                    changed.update(
+                        (x, y) for y in range(adjacency.height) if adjacency.walls[x][y] != old.walls[x][y]
+                    )
+
+        matrix = SurvivorDistanceMatrix.__new__(SurvivorDistanceMatrix)
+        matrix.points = self.points
+        matrix.adjacency = adjacency
+        matrix.reduced = self.reduced
+        matrix.settled = 0
+        cheaper = any(_entryCost(adjacency, pos) < _entryCost(old, pos) for pos in changed)
+        vectors = dict(zip(MOVES, MOVE_VECTORS))
+        rows = []
+        for i, source in enumerate(self.points):
+            stale = cheaper or source in changed
+            for path in self.paths[i]:
+                if stale or path is None:
+                    continue
+                x, y = source
+                for action in path:
+                    dx, dy = vectors[action]
+                    x, y = x + dx, y + dy
+                    if (x, y) in changed:
+                        stale = True
+                        break
+            if stale:
+                rows.append(matrix._searchFrom(i))
+            else:
+                rows.append((self.dist[i].tolist(), self.paths[i]))
+        matrix._store(rows)
+        return matrix
+
+    def _walkBack(self, adjacency, parent, u):
+        actions = []
+        while parent[u] is not None:
+            u, e = parent[u]
+            actions.append(adjacency.edges[e][1])
+        actions.reverse()
+        return tuple(actions)
+
+    def distance(self, i, j):
+        return float(self.dist[i, j])
+
+    def path(self, i, j):
+        return self.paths[i][j]
+
+
+def _entryCost(adjacency, pos):
+    """
+    Cost of entering pos in adjacency (np.inf for walls and cells no move
+    enters).
+    """
+    x, y = pos
+    target = adjacency.index(pos)
+    for dx, dy in MOVE_VECTORS:
+        prevx, prevy = x - dx, y - dy
+        if 0 <= prevx < adjacency.width and 0 <= prevy < adjacency.height:
+            u = adjacency.index((prevx, prevy))
+            for e in range(adjacency.offsets[u], adjacency.offsets[u + 1]):
+                if adjacency.targets[e] == target:
+                    return adjacency.costs[e]
+    return np.inf
+
+
+def getSurvivorDistances(problem):
+    """
+    Returns the SurvivorDistanceMatrix of a MultiSurvivorProblem (start and
+    every survivor of the problem), computed the first time it is asked for
+    and cached in problem.heuristicInfo and on the layout.
+    """
+    matrix = problem.heuristicInfo.get("survivorDistances")
+    if matrix is None:
+        points = (problem.getStartState()[0],) + tuple(problem.survivorPositions)
+        layoutKey = ("survivorDistances", points, problem.reduction is not None)
+        layoutCache = problem.startingMissionState.getLayout()._cache
+        matrix = layoutCache.get(layoutKey)
+        if matrix is None:
+            matrix = SurvivorDistanceMatrix(problem.adjacency, points)
+            matrix.reduced = problem.reduction is not None
+            layoutCache[layoutKey] = matrix
+        problem.heuristicInfo.pin("survivorDistances", matrix)
+    return matrix
+
+
+def mstCost(weights):
+    """
+    Total weight of a minimum spanning tree of the complete graph with the
+    given symmetric (n x n) weight matrix, by O(n^2) array-based Prim.
+    Returns np.inf if the graph is disconnected.
+    """
+    weights = np.asarray(weights)
+    n = len(weights)
+    if n <= 1:
+        return 0.0
+    inTree = np.zeros(n, dtype=bool)
+    inTree[0] = True
+    best = weights[0].astype(np.float64)
+    total = 0.0
+    for _ in range(n - 1):
+        candidates = np.where(inTree, np.inf, best)
+        v = int(np.argmin(candidates))
+        total += candidates[v]
+        inTree[v] = True
+        best = np.minimum(best, weights[v])
+    return float(total)
+
+
+class MSTLowerBounds:
+    """
+    Minimum spanning tree weights over subsets of the survivors of a
+    MultiSurvivorProblem, keyed by survivors bitmask (bit i = survivor i).
+
+    Edge weights are min(d(a, b), d(b, a)) from the survivor distance
+    matrix, so the MST of the survivors left is a lower bound on any walk
+    through them. bound(mask) runs the O(k^2) array Prim of mstCost once
+    per mask and remembers the result in cache (a bounded utils.LRUCache,
+    by default the problem's heuristicInfo, under ("mst", mask)). With
+    k <= maxTableSurvivors the bounds of all 2^k masks are built up front
+    instead, by running Prim on every mask at once with numpy, and
+    bound(mask) is one array read.
+    """
+
+    def __init__(self, matrix, maxTableSurvivors=16, cache=None):
+        dist = matrix.dist[1:, 1:]
+        self.weights = np.minimum(dist, dist.T)
+        self.k = len(self.weights)
+        self.table = None
+        self.bounds = utils.LRUCache() if cache is None else cache
+        if self.k <= maxTableSurvivors:
+            self.table = self._buildTable()
+
+    def bound(self, mask):
+        if self.table is not None:
+            return self.table[mask]
+        weight = self.bounds.get(("mst", mask))
+        if weight is None:
+            bits = [i for i in range(self.k) if mask >> i & 1]
+            weight = self.bounds[("mst", mask)] = mstCost(self.weights[np.ix_(bits, bits)])
+        return weight
+
+    def _buildTable(self):
+        """
+        Prim on all 2^k masks in lockstep: step s adds the cheapest edge
+        into each mask's tree, for the masks with more than s + 1 members.
+        """
+        k = self.k
+        masks = np.arange(1 << k)
+        members = ((masks[:, None] >> np.arange(k)) & 1).astype(bool)
+        size = members.sum(axis=1)
+        rows = np.arange(1 << k)
+        # Every tree starts at the lowest survivor of its mask
+        first = np.argmax(members, axis=1)
+        inTree = np.zeros_like(members)
+        inTree[rows, first] = True
+        best = self.weights[first]
+        table = np.zeros(1 << k)
+        for step in range(k - 1):
+            candidates = np.where(members & ~inTree, best, np.inf)
+            v = np.argmin(candidates, axis=1)
+            grow = size > step + 1
+            table[grow] += candidates[rows[grow], v[grow]]
+            inTree[rows[grow], v[grow]] = True
+            best = np.where(grow[:, None], np.minimum(best, self.weights[v]), best)
+        return table
+
+
+def getMSTBounds(problem):
+    """
+    Returns the MSTLowerBounds of a MultiSurvivorProblem, built once and
+    pinned in problem.heuristicInfo, which also holds its per-mask bounds.
+    """
+    bounds = problem.heuristicInfo.get("mstBounds")
+    if bounds is None:
+        bounds = MSTLowerBounds(getSurvivorDistances(problem), cache=problem.heuristicInfo)
+        problem.heuristicInfo.pin("mstBounds", bounds)
+    return bounds
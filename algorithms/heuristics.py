@@ -1,6 +1,9 @@
 from typing import Any, Tuple
-from algorithms import utils
+import numpy as np
 from algorithms.problems import MultiSurvivorProblem
+from algorithms.distances import getCostToGo, getMSTBounds
+from algorithms.landmarks import getLandmarks
+from algorithms.patterns import getPatternDatabase
 
 
 def nullHeuristic(state, problem=None):
@@ -11,113 +14,147 @@ def nullHeuristic(state, problem=None):
     return 0
 
 
+def _goalsOf(problem):
+    """
+    The goal cells of a single-agent problem: problem.goals in multi-goal
+    mode, otherwise [problem.goal] (or [] if there is none).
+    """
+    goals = getattr(problem, "goals", None)
+    if goals is None:
+        goal = getattr(problem, "goal", None)
+        goals = [] if goal is None else [goal]
+    return goals
+
+
 def manhattanHeuristic(state, problem):
     """
-    The Manhattan distance heuristic.
+    The Manhattan distance heuristic (to the nearest goal in multi-goal mode).
     """
     pos = state
     
-    goal = getattr(problem, "goal", None)
-    if goal is None:
+    goals = _goalsOf(problem)
+    if not goals:
         return 0
-    return abs(pos[0] - goal[0]) + abs(pos[1]- goal[1])
+    return min(abs(pos[0] - goal[0]) + abs(pos[1]- goal[1]) for goal in goals)
+
+
+def manhattanSurvivorHeuristic(state, problem):
+    """
+    The Manhattan distance heuristic for the MultiSurvivorProblem: the
+    farthest remaining survivor is still at least that many moves away.
+    Needs no tables (see hotSwapAStarSearch).
+    """
+    (x, y), survivors = state
+    return max((abs(x - sx) + abs(y - sy) for sx, sy in survivors.asList()), default=0)
 
 
 def euclideanHeuristic(state, problem):
     """
-    The Euclidean distance heuristic.
+    The Euclidean distance heuristic (to the nearest goal in multi-goal mode).
     """
     pos = state
     
-    goal = getattr(problem, "goal", None)
-    if goal is None:
+    goals = _goalsOf(problem)
+    if not goals:
         return 0
-    dx = pos[0] - goal[0]
-    dy = pos[1] - goal[1]
-    return (dx**2 + dy**2) **0.5
+    return min(((pos[0] - goal[0])**2 + (pos[1] - goal[1])**2) **0.5 for goal in goals)
 
 
-def survivorHeuristic(state: Tuple[Tuple, Any], problem: MultiSurvivorProblem):
+def costToGoHeuristic(state, problem):
     """
-    Your heuristic for the MultiSurvivorProblem.
+    The exact heuristic for a SimpleSurvivorProblem: the true terrain-weighted
+    cost from state to the goal, read from the cached cost-to-go field.
 
-    state: (position, survivors_grid)
-    problem: MultiSurvivorProblem instance
+    In multi-goal mode the field is seeded with every survivor at once
+    (multi-source), so each call stays O(1) whatever the number of targets.
+    """
+    return getCostToGo(problem).distance(state)
 
-    This must be admissible and preferably consistent.
 
-    Hints:
-    - Use problem.heuristicInfo to cache expensive computations
-    - Go with some simple heuristics first, then build up to more complex ones
-    - Consider: distance to nearest survivor + MST of remaining survivors
-    - Balance heuristic strength vs. computation time (do experiments!)
+def landmarkHeuristic(state, problem):
+    """
+    ALT heuristic for a SimpleSurvivorProblem: the best triangle-inequality
+    bound over the layout's landmarks (see LandmarkTable), to the nearest
+    goal in multi-goal mode. O(landmarks) per goal and far tighter than
+    Manhattan when walls force detours.
     """
-    pos, survivors_grid = state
+    landmarks = getLandmarks(problem)
+    return min((landmarks.lowerBound(state, goal) for goal in _goalsOf(problem)), default=0)
 
-    if hasattr(survivors_grid, "asList"):
-        survivors = survivors_grid.asList()
-    else:
-        survivors = list(survivors_grid)
 
-    if not survivors:
+def landmarkSurvivorHeuristic(state, problem):
+    """
+    ALT heuristic for the MultiSurvivorProblem: every remaining survivor
+    must still be reached, so the largest landmark bound over them is a
+    lower bound. Admissible and consistent like each bound it takes the
+    max of, and needs no per-survivor tables.
+    """
+    pos, survivors = state
+    landmarks = getLandmarks(problem)
+    best = 0
+    for target in survivors.asList():
+        bound = landmarks.lowerBound(pos, target)
+        if bound > best:
+            best = bound
+    return best
+
+
+def patternDatabaseHeuristic(state, problem):
+    """
+    Pattern database heuristic for the MultiSurvivorProblem: the largest
+    exact cost of rescuing what is left of one survivor group, read from
+    the PatternDatabase (built once per layout, then loaded from disk).
+    """
+    pos, survivors = state
+    return getPatternDatabase(problem).value(pos, int(survivors))
+
+
+def survivorHeuristic(state: Tuple[Tuple, Any], problem: MultiSurvivorProblem):
+    """
+    Heuristic for the MultiSurvivorProblem: the terrain-weighted maze
+    distance to the nearest remaining survivor plus the weight of a minimum
+    spanning tree over the remaining survivors.
+
+    state: (position, survivors) where survivors is a SurvivorMask (reads like a Grid)
+    problem: MultiSurvivorProblem instance
+
+    Distances to each survivor come from one cost-to-go field per survivor
+    (reverse Dijkstra, see getCostToGo), stored per cell as a tuple. The MST
+    bound is looked up by survivors mask in MSTLowerBounds, whose weights
+    are min(d(a, b), d(b, a)): any walk through the survivors is a spanning
+    tree whose legs cost at least that much. Admissible and consistent
+    (checked by verify_heuristics.py).
+    """
+    pos, survivors = state
+    mask = int(survivors)
+    if mask == 0:
         return 0
 
     hinfo = problem.heuristicInfo
-    dist_cache = hinfo.setdefault("dist_cache", {})  
-    mst_cache  = hinfo.setdefault("mst_cache", {})    
-
-    def cached_dist(a, b):
-        key = (a, b) if a <= b else (b, a)
-        d = dist_cache.get(key)
-        if d is None:
-            d = manhattanHeuristic(a, b)
-            dist_cache[key] = d
-        return d
-
-    nearest = None
-    for s in survivors:
-        d = cached_dist(pos, s)
-        if nearest is None or d < nearest:
+    toSurvivor = hinfo.get("toSurvivor")
+    if toSurvivor is None:
+        toSurvivor = hinfo.pin("toSurvivor", _survivorDistanceTable(problem))
+
+    row = toSurvivor[pos]
+    nearest = float("inf")
+    left = mask
+    while left:
+        low = left & -left
+        d = row[low.bit_length() - 1]
+        if d < nearest:
             nearest = d
+        left ^= low
+    return nearest + getMSTBounds(problem).bound(mask)
 
-    points_key = frozenset(survivors)
-    mst_cost = mst_cache.get(points_key)
-    if mst_cost is None:
-        if len(survivors) == 1:
-            mst_cost = 0
-        else:
-            start = survivors[0]
-            visited = set([start])
-
-            pq = utils.PriorityQueue()
-            for v in survivors[1:]:
-                pq.push(v, cached_dist(start, v))
-
-            mst_cost = 0
-            while len(visited) < len(survivors):
-                v = pq.pop()
-                if v in visited:
-                    continue
-
-                best = None
-                for u in visited:
-                    d = cached_dist(u, v)
-                    if best is None or d < best:
-                        best = d
-                mst_cost += best
-
-                visited.add(v)
-
-                for w in survivors:
-                    if w in visited:
-                        continue
-                    best_w = None
-                    for u in visited:
-                        d = cached_dist(u, w)
-                        if best_w is None or d < best_w:
-                            best_w = d
-                    pq.push(w, best_w)
-
-        mst_cache[points_key] = mst_cost
-
-    return nearest + mst_cost
+
+def _survivorDistanceTable(problem):
+    """
+    Maps every free cell to the tuple of its maze distances to each survivor
+    of problem (np.inf where unreachable).
+    """
+    fields = [getCostToGo(problem, [s]) for s in problem.survivorPositions]
+    stacked = np.stack([field.dist for field in fields], axis=-1)
+    table = {}
+    for x, y in problem.walls.asList(False):
+        table[(x, y)] = tuple(stacked[x, y].tolist())
+    return table
@@ -0,0 +1,221 @@
+import heapq
+import pickle
+from world.game import Actions, MOVE_VECTORS
+from algorithms import utils
+
+
+class ContractionHierarchy:
+    """
+    A Contraction Hierarchy over the terrain-weighted grid graph of a layout.
+
+    Moving into a cell costs that cell's terrain cost, so the graph is
+    directed (u->v costs cost(v), v->u costs cost(u)). Nodes are contracted
+    one by one in order of edge difference; whenever the only shortest path
+    between two neighbors of the contracted node runs through it, a shortcut
+    edge remembering that middle node is added.
+
+    A query is a bidirectional Dijkstra that only relaxes edges leading to
+    higher-ranked nodes, so it settles a few dozen nodes instead of the map.
+    Shortcuts are unpacked recursively back to primitive Directions.
+    """
+
+    VERSION = 1
+
+    def __init__(self, layout, witnessLimit=50):
+        """
+        layout: RescueLayout to build the hierarchy for
+        witnessLimit: max nodes settled by each witness search
+        """
+        walls = layout.walls
+        self.cells = walls.asList(False)
+        self.index = dict((cell, i) for i, cell in enumerate(self.cells))
+        n = len(self.cells)
+
+        # Working graph: out[u][v] = cost, into[v][u] = cost
+        out = [dict() for _ in range(n)]
+        into = [dict() for _ in range(n)]
+        for u, (x, y) in enumerate(self.cells):
+            for dx, dy in MOVE_VECTORS:
+                nextPos = (x + dx, y + dy)
+                v = self.index.get(nextPos)
+                if v is not None:
+                    cost = layout.getTerrainCost(*nextPos)
+                    out[u][v] = cost
+                    into[v][u] = cost
+
+        self.middle = {}  # (u, w) -> contracted node of a shortcut
+        self.rank = [0] * n
+        contracted = [False] * n
+        deleted = [0] * n  # Contracted neighbors, keeps the ordering spatially uniform
+
+        def shortcuts(v):
+            """Shortcuts needed if v were contracted now."""
+            needed = []
+            targets = dict((w, c) for w, c in out[v].items() if not contracted[w])
+            for u, cIn in into[v].items():
+                if contracted[u]:
+                    continue
+                limit = cIn + max(targets.values()) if targets else 0
+                dist = self._witnessSearch(out, contracted, u, v, limit, witnessLimit)
+                for w, cOut in targets.items():
+                    if w != u and dist.get(w, float("inf")) > cIn + cOut:
+                        needed.append((u, w, cIn + cOut))
+            return needed
+
+        def priority(v):
+            return len(shortcuts(v)) - len(out[v]) - len(into[v]) + deleted[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            # Lazy update: re-evaluate and requeue if v is no longer the minimum
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+            for u, w, cost in shortcuts(v):
+                if cost < out[u].get(w, float("inf")):
+                    out[u][w] = cost
+                    into[w][u] = cost
+                    self.middle[(u, w)] = v
+            contracted[v] = True
+            self.rank[v] = order
+            order += 1
+            for neighbor in list(out[v]) + list(into[v]):
+                deleted[neighbor] += 1
+
+        # Search graphs: forward edges going up, backward edges coming down
+        self.up = [[] for _ in range(n)]
+        self.down = [[] for _ in range(n)]
+        for u in range(n):
+            for w, cost in out[u].items():
+                if self.rank[w] > self.rank[u]:
+                    self.up[u].append((w, cost))
+                else:
+                    self.down[w].append((u, cost))
+
+    def _witnessSearch(self, out, contracted, source, skip, limit, settleLimit):
+        """
+        Dijkstra from source over uncontracted nodes, avoiding skip, bounded
+        by cost limit and number of settled nodes.
+        """
+        dist = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        while heap and settled < settleLimit:
+            d, u = heapq.heappop(heap)
+            if d > dist[u] or d > limit:
+                continue
+            settled += 1
+            for w, cost in out[u].items():
+                if w == skip or contracted[w]:
+                    continue
+                nd = d + cost
+                if nd < dist.get(w, float("inf")):
+                    dist[w] = nd
+                    heapq.heappush(heap, (nd, w))
+        return dist
+
+    def query(self, start, goal):
+        """
+        Returns (cost, actions) of a cheapest path from start to goal, or
+        (None, None) if goal cannot be reached. Also stores the number of
+        settled nodes in self.lastSettled.
+        """
+        s, t = self.index[start], self.index[goal]
+        dist = [{s: 0}, {t: 0}]
+        parent = [{s: None}, {t: None}]
+        heaps = [[(0, s)], [(0, t)]]
+        graphs = [self.up, self.down]
+        best, meet = float("inf"), None
+        self.lastSettled = 0
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                if not heaps[side]:
+                    continue
+                d, u = heapq.heappop(heaps[side])
+                if d > dist[side][u]:
+                    continue
+                if d >= best:
+                    heaps[side] = []  # Nothing cheaper can come from this side
+                    continue
+                self.lastSettled += 1
+                if u in dist[1 - side] and d + dist[1 - side][u] < best:
+                    best, meet = d + dist[1 - side][u], u
+                for w, cost in graphs[side][u]:
+                    nd = d + cost
+                    if nd < dist[side].get(w, float("inf")):
+                        dist[side][w] = nd
+                        parent[side][w] = u
+                        heapq.heappush(heaps[side], (nd, w))
+
+        if meet is None:
+            return None, None
+
+        nodes = []
+        u = meet
+        while u is not None:
+            nodes.append(u)
+            u = parent[0][u]
+        nodes.reverse()
+        u = parent[1][meet]
+        while u is not None:
+            nodes.append(u)
+            u = parent[1][u]
+        return best, self._toActions(self._unpack(nodes))
+
+    def _unpack(self, nodes):
+        """
+        Replaces every shortcut in a node path by the nodes it skips.
+        """
+        path = [nodes[0]]
+        stack = [(u, w) for u, w in zip(nodes, nodes[1:])]
+        stack.reverse()
+        while stack:
+            u, w = stack.pop()
+            v = self.middle.get((u, w))
+            if v is None:
+                path.append(w)
+            else:
+                stack.append((v, w))
+                stack.append((u, v))
+        return path
+
+    def _toActions(self, path):
+        actions = []
+        for u, w in zip(path, path[1:]):
+            (x, y), (nextx, nexty) = self.cells[u], self.cells[w]
+            actions.append(Actions.vectorToDirection((nextx - x, nexty - y)))
+        return actions
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump((self.VERSION, self.__dict__), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            version, state = pickle.load(f)
+        if version != cls.VERSION:
+            raise ValueError("Stale contraction hierarchy file " + path)
+        ch = cls.__new__(cls)
+        ch.__dict__.update(state)
+        return ch
+
+
+def getHierarchy(layout):
+    """
+    Returns the ContractionHierarchy of layout, loading it from the disk cache
+    when a previous run already built it for the same layout.
+    """
+    if "hierarchy" not in layout._cache:
+        path = utils.cachePath("ch", layout.fingerprint())
+        layout._cache["hierarchy"] = utils.loadOrBuild(
+            path, lambda: ContractionHierarchy(layout), ContractionHierarchy.load, ContractionHierarchy.save
+        )
+    return layout._cache["hierarchy"]
@@ -0,0 +1,156 @@
+import heapq
+import pickle
+import numpy as np
+from algorithms import utils
+from algorithms.distances import CostToGoField
+from world.game import MOVE_VECTORS
+
+LANDMARK_COUNT = 8  # Default number of landmarks (set with --landmarks)
+
+
+class LandmarkTable:
+    """
+    ALT (A*, landmarks, triangle inequality) lower bounds on the
+    terrain-weighted maze distance between any two free cells.
+
+    For each landmark l, fromLandmark[k] holds d(l, v) and toLandmark[k]
+    holds d(v, l) for every cell v (np.inf if unreachable). Moves cost the
+    cell entered, so the two differ. For any cells u and t:
+        d(u, t) >= d(l, t) - d(l, u)      (l -> u -> t is a walk from l to t)
+        d(u, t) >= d(u, l) - d(t, l)      (u -> t -> l is a walk from u to l)
+    and lowerBound(u, t) is the largest of these 2L bounds (at least 0).
+
+    Landmarks are picked by farthest-point sampling: the first is the cell
+    farthest from an arbitrary one, each next one the cell farthest from
+    the landmarks chosen so far, so they end up in the far corners and dead
+    ends of the map, where the bounds are tightest.
+    """
+
+    VERSION = 1
+
+    def __init__(self, walls, costFn, count=LANDMARK_COUNT):
+        """
+        walls: Grid of walls
+        costFn: function (x,y)->cost of entering a cell
+        count: number of landmarks (fewer if the map has fewer free cells)
+        """
+        self.cells = walls.asList(False)
+        self.landmarks = []
+        forward, backward = [], []
+        if self.cells:
+            seed = _distancesFrom(walls, costFn, self.cells[0])
+            reachable = np.isfinite(seed)
+            candidate = np.unravel_index(np.argmax(np.where(reachable, seed, -np.inf)), seed.shape)
+            nearest = np.where(reachable, np.inf, -np.inf)  # Only cells reached from the seed are candidates
+            for _ in range(min(count, len(self.cells))):
+                landmark = (int(candidate[0]), int(candidate[1]))
+                self.landmarks.append(landmark)
+                forward.append(_distancesFrom(walls, costFn, landmark))
+                backward.append(CostToGoField(walls, costFn, [landmark]).dist)
+                # Each cell's (finite) distance to its nearest landmark, either way round
+                spread = np.minimum(forward[-1], backward[-1])
+                nearest = np.where(np.isfinite(spread), np.minimum(nearest, spread), nearest)
+                candidate = np.unravel_index(np.argmax(nearest), nearest.shape)
+                if nearest[candidate] <= 0:
+                    break
+        self.fromLandmark = np.array(forward)
+        self.toLandmark = np.array(backward)
+        self._buildRows()
+
+    def _buildRows(self):
+        """
+        rows maps every free cell to its (d(l, v) for each l, d(v, l) for
+        each l) tuples, so lowerBound runs on plain floats.
+        """
+        self.rows = {}
+        for x, y in self.cells:
+            self.rows[(x, y)] = (
+                tuple(self.fromLandmark[:, x, y].tolist()),
+                tuple(self.toLandmark[:, x, y].tolist()),
+            )
+
+    def lowerBound(self, u, t):
+        """
+        Returns a lower bound on the cost of walking from cell u to cell t
+        (np.inf when a landmark proves t unreachable from u).
+        """
+        fromU, toU = self.rows[u]
+        fromT, toT = self.rows[t]
+        best = 0
+        # inf - inf is nan, which never compares greater and so is skipped
+        for a, b in zip(fromT, fromU):
+            if a - b > best:
+                best = a - b
+        for a, b in zip(toU, toT):
+            if a - b > best:
+                best = a - b
+        return best
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump((self.VERSION, self.cells, self.landmarks, self.fromLandmark, self.toLandmark), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state[0] != cls.VERSION:
+            raise ValueError("Stale landmark file " + path)
+        table = cls.__new__(cls)
+        version, table.cells, table.landmarks, table.fromLandmark, table.toLandmark = state
+        table._buildRows()
+        return table
+
+
+def _distancesFrom(walls, costFn, source):
+    """
+    Terrain-weighted distance from source to every cell (forward Dijkstra,
+    np.inf for walls and unreachable cells).
+    """
+    width, height = walls.width, walls.height
+    dist = [float("inf")] * (width * height)
+    dist[source[0] * height + source[1]] = 0
+    heap = [(0, source[0], source[1])]
+    while heap:
+        d, x, y = heapq.heappop(heap)
+        if d > dist[x * height + y]:
+            continue
+        for dx, dy in MOVE_VECTORS:
+            nextx, nexty = x + dx, y + dy
+            if walls[nextx][nexty]:
+                continue
+            nd = d + costFn((nextx, nexty))
+            i = nextx * height + nexty
+            if nd < dist[i]:
+                dist[i] = nd
+                heapq.heappush(heap, (nd, nextx, nexty))
+    return np.array(dist, dtype=np.float64).reshape(width, height)
+
+
+def getLandmarks(problem, count=None):
+    """
+    Returns the LandmarkTable of a SimpleSurvivorProblem or
+    MultiSurvivorProblem, pinned in problem.heuristicInfo. With default
+    terrain costs the table is also kept on the layout and in the disk
+    cache (keyed by layout fingerprint), so later runs on the same layout
+    load it instead of running the 2L Dijkstras again.
+    """
+    if count is None:
+        count = LANDMARK_COUNT
+    reduced = problem.reduction is not None
+    key = ("landmarks", count, reduced)
+    table = problem.heuristicInfo.get(key)
+    if table is None:
+        build = lambda: LandmarkTable(problem.walls, problem.costFn, count)
+        if problem.terrainCosts:
+            layout = problem.layout
+            table = layout._cache.get(key)
+            if table is None:
+                kind = "landmarks%d%s" % (count, "r" if reduced else "")
+                path = utils.cachePath(kind, layout.fingerprint())
+                table = utils.loadOrBuild(path, build, LandmarkTable.load, LandmarkTable.save)
+                layout._cache[key] = table
+        else:
+            table = build()
+        problem.heuristicInfo.pin(key, table)
+    return table
@@ -0,0 +1,174 @@
+import hashlib
+import pickle
+import numpy as np
+from algorithms import utils
+from algorithms.distances import CostToGoField, getSurvivorDistances
+from world.rescue_layout import RescueLayout
+
+PATTERN_GROUP_SIZE = 8  # Survivors per pattern database group
+
+
+class PatternDatabase:
+    """
+    Pattern databases for a MultiSurvivorProblem.
+
+    The survivors are split into groups of at most groupSize, each spread
+    over the whole map (see _groupSurvivors). For each group,
+    tables[g][S][x, y] is the exact cost of rescuing the subset S of the
+    group (bit k = k-th survivor of the group) starting from (x, y),
+    ignoring every other survivor: the abstract problem's cost to go,
+    computed from one cost-to-go field per survivor and a Held-Karp over
+    the group.
+
+    Any real route that rescues everyone left also rescues the group's
+    remaining survivors, so every table is a lower bound and value() takes
+    their max. Summing them is not admissible here: one walk down a
+    corridor serves survivors of several groups. Each table is exact for
+    its abstraction, so the max is also consistent.
+
+    The groups are built in a process pool (one job per group); the tables
+    pickle as plain arrays, so getPatternDatabase keeps them on disk.
+    """
+
+    VERSION = 1
+
+    def __init__(self, problem, groupSize=PATTERN_GROUP_SIZE, workers=None):
+        """
+        problem: MultiSurvivorProblem with default terrain costs
+        groupSize: most survivors per group (tables hold 2^groupSize layers)
+        workers: processes building the groups (default: one per CPU)
+        """
+        survivors = problem.survivorPositions
+        self.groups = _groupSurvivors(getSurvivorDistances(problem), groupSize)
+        jobs = [
+            (problem.layout.layoutText, problem.reduction is not None, [survivors[i] for i in group])
+            for group in self.groups
+        ]
+        self.tables, workers = utils.parallelMap(_buildGroupTable, jobs, workers)
+        self.cells = problem.walls.asList(False)
+        self._buildRows()
+
+    def _buildRows(self):
+        """
+        rows maps every free cell to one tuple per group, indexed by subset.
+        """
+        self.rows = {}
+        for x, y in self.cells:
+            self.rows[(x, y)] = tuple(tuple(table[:, x, y].tolist()) for table in self.tables)
+
+    def value(self, pos, mask):
+        """
+        Returns the largest table value for the survivors of mask (problem
+        bits) left and the rescuer on pos.
+        """
+        best = 0
+        for group, row in zip(self.groups, self.rows[pos]):
+            subset = 0
+            for k, i in enumerate(group):
+                if mask >> i & 1:
+                    subset |= 1 << k
+            if row[subset] > best:
+                best = row[subset]
+        return best
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump((self.VERSION, self.groups, self.cells, self.tables), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state[0] != cls.VERSION:
+            raise ValueError("Stale pattern database file " + path)
+        pdb = cls.__new__(cls)
+        version, pdb.groups, pdb.cells, pdb.tables = state
+        pdb._buildRows()
+        return pdb
+
+
+def _groupSurvivors(matrix, groupSize):
+    """
+    Splits the survivor indices of a SurvivorDistanceMatrix into groups of
+    at most groupSize. The survivors are chained nearest-neighbour style (by
+    min(d(a, b), d(b, a))) and dealt round-robin along the chain, so each
+    group spreads over the whole map: with max combination a group of far
+    apart survivors gives a much larger bound than a tight cluster. Only
+    survivor-to-survivor distances are used, so the groups do not depend on
+    the start.
+    """
+    dist = matrix.dist[1:, 1:]
+    near = np.minimum(dist, dist.T)
+    if len(near) == 0:
+        return []
+    chain = [0]
+    left = set(range(1, len(near)))
+    while left:
+        nearest = min(left, key=lambda j: (near[chain[-1], j], j))
+        chain.append(nearest)
+        left.remove(nearest)
+    count = -(-len(chain) // groupSize)
+    return [tuple(sorted(chain[g::count])) for g in range(count)]
+
+
+def _buildGroupTable(job):
+    """
+    Builds one group's table (runs in a worker process). job is
+    (layoutText, reduced, survivors); returns the (2^n, width, height)
+    array of exact costs to rescue each subset of the n survivors.
+    """
+    layoutText, reduced, survivors = job
+    layout = RescueLayout(layoutText)
+    walls = layout.getReduction().prunedWalls if reduced else layout.walls
+    costFn = lambda pos: layout.getTerrainCost(pos[0], pos[1])
+    toSurvivor = [CostToGoField(walls, costFn, [s]).dist for s in survivors]
+    n = len(survivors)
+
+    # tour[S][j]: cheapest walk that starts on survivor j (in S) and rescues the rest of S
+    tour = np.full((1 << n, n), np.inf)
+    for j in range(n):
+        tour[1 << j, j] = 0
+    for subset in range(1, 1 << n):
+        for j in range(n):
+            if not subset >> j & 1 or subset == 1 << j:
+                continue
+            rest = subset & ~(1 << j)
+            for k in range(n):
+                if rest >> k & 1:
+                    x, y = survivors[j]
+                    cost = toSurvivor[k][x, y] + tour[rest, k]
+                    if cost < tour[subset, j]:
+                        tour[subset, j] = cost
+
+    table = np.zeros((1 << n, walls.width, walls.height), dtype=np.float32)  # Exact for integer costs
+    for subset in range(1, 1 << n):
+        table[subset] = np.min(
+            [toSurvivor[j] + tour[subset, j] for j in range(n) if subset >> j & 1], axis=0
+        )
+    return table
+
+
+def getPatternDatabase(problem, groupSize=None):
+    """
+    Returns the PatternDatabase of a MultiSurvivorProblem, pinned in
+    problem.heuristicInfo. It is also kept on the layout and in the disk
+    cache, keyed by layout fingerprint and survivor list, so later missions
+    on the same building load it instead of building it.
+    """
+    if groupSize is None:
+        groupSize = PATTERN_GROUP_SIZE
+    reduced = problem.reduction is not None
+    key = ("patternDatabase", tuple(problem.survivorPositions), groupSize, reduced)
+    pdb = problem.heuristicInfo.get(key)
+    if pdb is None:
+        layout = problem.layout
+        pdb = layout._cache.get(key)
+        if pdb is None:
+            survivorsKey = hashlib.sha1(repr(key).encode()).hexdigest()[:8]
+            path = utils.cachePath("pdb-" + survivorsKey, layout.fingerprint())
+            pdb = utils.loadOrBuild(
+                path, lambda: PatternDatabase(problem, groupSize), PatternDatabase.load, PatternDatabase.save
+            )
+            layout._cache[key] = pdb
+        problem.heuristicInfo.pin(key, pdb)
+    return pdb
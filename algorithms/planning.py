@@ -0,0 +1,166 @@
+from algorithms.utils import PriorityQueue
+from algorithms.distances import getCostToGo
+from algorithms.heuristics import nullHeuristic
+
+
+def nearestGoals(problem, k=1):
+    """
+    Finds the k cheapest goals of a multi-goal SimpleSurvivorProblem with a
+    single Dijkstra from the start that stops once k goal cells are settled.
+
+    Returns a list of (goal, cost, actions) sorted by cost (fewer than k
+    entries if fewer goals are reachable). Not a search function for -f:
+    it returns several candidate goals rather than one plan.
+    """
+    start = problem.getStartState()
+    goals = set(problem.goals)
+    frontera = PriorityQueue()
+    frontera.push(start, 0)
+    costo_a_nodo = {start: 0}
+    edge_from = {}
+    cerrados = set()
+    encontrados = []
+
+    while not frontera.isEmpty() and len(encontrados) < k:
+        estado = frontera.pop()
+        if estado in cerrados:
+            continue
+        cerrados.add(estado)
+        if estado in goals:
+            encontrados.append(estado)
+        for succ, accion, costo in problem.getSuccessors(estado):
+            nuevo_costo = costo_a_nodo[estado] + costo
+            if nuevo_costo < costo_a_nodo.get(succ, float("inf")):
+                costo_a_nodo[succ] = nuevo_costo
+                edge_from[succ] = (estado, accion)
+                frontera.push(succ, nuevo_costo)
+
+    resultados = []
+    for goal in encontrados:
+        acciones = []
+        nodo = goal
+        while nodo != start:
+            padre, accion = edge_from[nodo]
+            acciones.append(accion)
+            nodo = padre
+        acciones.reverse()
+        resultados.append((goal, costo_a_nodo[goal], acciones))
+    return resultados
+
+
+def _spurSearch(problem, start, heuristic, bannedStates, bannedEdges):
+    """
+    A* from start to a goal that never enters bannedStates and never takes
+    an edge (state, action) in bannedEdges.
+
+    Returns (states, actions, cost, expanded); states is None if no goal
+    can be reached.
+    """
+    frontera = PriorityQueue()
+    frontera.push(start, heuristic(start, problem))
+    best_cost = {start: 0}
+    edge_from = {}
+    cerrados = set()
+    expanded = 0
+
+    while not frontera.isEmpty():
+        estado = frontera.pop()
+        if estado in cerrados:
+            continue
+        cerrados.add(estado)
+        if problem.isGoalState(estado):
+            states, actions = [estado], []
+            while estado != start:
+                estado, accion = edge_from[estado]
+                states.append(estado)
+                actions.append(accion)
+            states.reverse()
+            actions.reverse()
+            return states, actions, best_cost[states[-1]], expanded
+        expanded += 1
+        for succ, accion, costo in problem.getSuccessors(estado):
+            if succ in bannedStates or (estado, accion) in bannedEdges:
+                continue
+            nuevo_cost = best_cost[estado] + costo
+            if nuevo_cost < best_cost.get(succ, float("inf")):
+                best_cost[succ] = nuevo_cost
+                edge_from[succ] = (estado, accion)
+                frontera.push(succ, nuevo_cost + heuristic(succ, problem))
+    return None, None, None, expanded
+
+
+def kShortestPaths(problem, k=3, maxOverlap=None, heuristic=None):
+    """
+    Yen's algorithm: the k cheapest loopless plans to a goal, best first.
+
+    Each new candidate is a prefix (root) of an accepted plan followed by a
+    spur search that avoids the root and the edges already used after it.
+    For single-agent problems with a goal, the spur searches reuse the
+    shortest-path tree toward the goal (the cached cost-to-go field) as an
+    exact-on-the-original-graph heuristic, so a spur search only expands
+    the detour it is forced to take instead of the whole map.
+
+    maxOverlap: if set, a candidate sharing more than this fraction of its
+    cells with an accepted plan is skipped (diversity constraint).
+
+    Returns a list of (actions, cost, expanded) where expanded is the number
+    of nodes expanded since the previous plan was accepted. Not a search
+    function for -f: it returns several alternative plans.
+    """
+    if heuristic is None:
+        if getattr(problem, "goals", None):
+            heuristic = lambda state, problem: getCostToGo(problem).distance(state)
+        else:
+            heuristic = nullHeuristic
+
+    states, actions, cost, expanded = _spurSearch(problem, problem.getStartState(), heuristic, set(), set())
+    if states is None:
+        return []
+    accepted = [(states, actions, cost)]
+    results = [(actions, cost, expanded)]
+    candidates = PriorityQueue()
+    seen = {tuple(actions)}
+    work = 0
+
+    def overlap(candidate, plan):
+        shared = len(set(candidate) & set(plan))
+        return shared / float(max(len(candidate), 1))
+
+    while len(results) < k:
+        prevStates, prevActions, _ = accepted[-1]
+        for i in range(len(prevStates) - 1):
+            spur = prevStates[i]
+            rootStates, rootActions = prevStates[: i + 1], prevActions[:i]
+            rootCost = problem.getCostOfActions(rootActions) if rootActions else 0
+
+            # Ban the next edge of every accepted plan sharing this root
+            bannedEdges = set()
+            for states, actions, _ in accepted:
+                if states[: i + 1] == rootStates:
+                    bannedEdges.add((spur, actions[i]))
+            bannedStates = set(rootStates[:-1])
+
+            spurStates, spurActions, spurCost, expanded = _spurSearch(
+                problem, spur, heuristic, bannedStates, bannedEdges
+            )
+            work += expanded
+            if spurStates is None:
+                continue
+            candidateActions = rootActions + spurActions
+            if tuple(candidateActions) in seen:
+                continue
+            seen.add(tuple(candidateActions))
+            candidateCost = rootCost + spurCost
+            candidates.push((rootStates[:-1] + spurStates, candidateActions, candidateCost), candidateCost)
+
+        # Accept the cheapest candidate that satisfies the diversity constraint
+        while not candidates.isEmpty():
+            states, actions, cost = candidates.pop()
+            if maxOverlap is None or all(overlap(states, plan) <= maxOverlap for plan, _, _ in accepted):
+                break
+        else:
+            break
+        accepted.append((states, actions, cost))
+        results.append((actions, cost, work))
+        work = 0
+    return results
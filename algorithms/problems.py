@@ -1,4 +1,6 @@
 from algorithms import utils
+from algorithms.corridors import CorridorGraph, expandActions
+from algorithms.distances import getSurvivorDistances
 from world.game import Directions, Actions
 from world.rescue_state import RescueState
 
@@ -45,6 +47,16 @@ class SearchProblem:
         """
         utils.raiseNotDefined()
 
+    def expandActions(self, actions):
+        """
+         actions: A plan returned by a search function
+
+        Returns the plan as a list of primitive Directions. Problems whose
+        successors use macro actions (e.g. contracted corridors) override or
+        reuse this to unpack them; for primitive plans it is the identity.
+        """
+        return expandActions(actions)
+
 
 class SimpleSurvivorProblem(SearchProblem):
     """
@@ -53,6 +65,10 @@ class SimpleSurvivorProblem(SearchProblem):
     State: (x, y) position. 
     Goal: survivor cell.
     Terrain costs apply by default.
+
+    When the map has several survivors the problem switches to multi-goal
+    mode: the goal test accepts any survivor cell (problem.goals) and
+    problem.goal is None, so the search finds the nearest survivor.
     """
 
     def __init__(
@@ -63,6 +79,9 @@ class SimpleSurvivorProblem(SearchProblem):
         start=None,
         warn=True,
         visualize=True,
+        contract=False,
+        reduce=True,
+        multiGoal=True,
     ):
         """
         rescueState: RescueState
@@ -71,8 +90,12 @@ class SimpleSurvivorProblem(SearchProblem):
         start: optional override for start position
         warn: print warnings if map doesn't match expectations
         visualize: enable visited bookkeeping for display/stats
+        contract: search the corridor-contracted graph (macro actions)
+        reduce: search the reduced layout (see world/layout_reduction.py)
+        multiGoal: with several survivors, target any of them instead of the fallback goal
         """
 
+        self.layout = rescueState.getLayout()
         self.walls = rescueState.getWalls()
 
         # Start state (rescuer position unless overridden)
@@ -86,6 +109,9 @@ class SimpleSurvivorProblem(SearchProblem):
         if len(survivors) == 1:
             # This is a normal "beacon" case: exactly one survivor on map
             self.goal = survivors[0]
+        elif len(survivors) > 1 and multiGoal:
+            # Several beacons: reach whichever survivor is cheapest
+            self.goal = None
         else:
             # Fallback to provided goal (default (1,1))
             self.goal = goal
@@ -100,8 +126,11 @@ class SimpleSurvivorProblem(SearchProblem):
                         "Warning: %d survivors found; using goal=%s (consider a different problem type)"
                         % (len(survivors), str(self.goal))
                     )
+        self.goals = survivors if self.goal is None else [self.goal]
+        self._goalSet = set(self.goals)
 
         # Use terrain cost from rescue state so search cost matches game cumulative cost
+        self.terrainCosts = costFn is None
         if costFn is None:
             costFn = lambda pos: rescueState.getTerrainCost(pos[0], pos[1])
         self.costFn = costFn
@@ -115,6 +144,27 @@ class SimpleSurvivorProblem(SearchProblem):
                 % (str(self.goal),)
             )
 
+        # Drop dead ends and unreachable cells unless start or goal lies in them
+        self.reduction = None
+        if reduce:
+            reduction = rescueState.getLayout().getReduction()
+            if all(reduction.isFree(pos) for pos in [self.startState] + self.goals):
+                self.walls = reduction.prunedWalls
+                self.reduction = reduction
+
+        # Collapse corridors into weighted edges; start, goal and survivors stay as nodes
+        self.corridors = None
+        if contract:
+            keep = [self.startState] + self.goals + survivors
+            self.corridors = CorridorGraph(self.walls, self.costFn, keep)
+
+        # Precompiled moves, only valid for the layout's own terrain costs
+        self.adjacency = None
+        if self.terrainCosts:
+            self.adjacency = self.layout.getAdjacency(self.reduction is not None)
+
+        self.heuristicInfo = utils.LRUCache()  # For caching heuristic computations (bounded)
+
         # For visualization/statistics
         self._visited, self._visitedlist, self._expanded = {}, [], 0
 
@@ -122,7 +172,7 @@ class SimpleSurvivorProblem(SearchProblem):
         return self.startState
 
     def isGoalState(self, state):
-        isGoal = state == self.goal
+        isGoal = state in self._goalSet
 
         # For visualization: mark nodes as visited
         if isGoal and self.visualize:
@@ -143,7 +193,27 @@ class SimpleSurvivorProblem(SearchProblem):
         (successor, action, stepCost)
 
         This is where terrain costs come into play via costFn.
+        With contract=True each action is a tuple of Directions walking a
+        whole corridor, and stepCost is the summed cost of that corridor.
         """
+        if self.corridors is not None:
+            successors = list(self.corridors.getEdges(state))
+        elif self.adjacency is not None:
+            adjacency = self.adjacency
+            i = state[0] * adjacency.height + state[1]
+            successors = adjacency.edges[adjacency.offsets[i] : adjacency.offsets[i + 1]]
+        else:
+            successors = self._primitiveSuccessors(state)
+
+        # Bookkeeping for display
+        self._expanded += 1
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return successors
+
+    def _primitiveSuccessors(self, state):
         successors = []
         for action in [
             Directions.NORTH,
@@ -159,13 +229,6 @@ class SimpleSurvivorProblem(SearchProblem):
                 nextState = (nextx, nexty)
                 cost = self.costFn(nextState)
                 successors.append((nextState, action, cost))
-
-        # Bookkeeping for display
-        self._expanded += 1
-        if state not in self._visited:
-            self._visited[state] = True
-            self._visitedlist.append(state)
-
         return successors
 
     def getCostOfActions(self, actions):
@@ -177,7 +240,7 @@ class SimpleSurvivorProblem(SearchProblem):
 
         x, y = self.getStartState()
         cost = 0
-        for action in actions:
+        for action in self.expandActions(actions):
             dx, dy = Actions.directionToVector(action)
             x, y = int(x + dx), int(y + dy)
             if self.walls[x][y]:
@@ -186,32 +249,123 @@ class SimpleSurvivorProblem(SearchProblem):
         return cost
 
 
+class SurvivorMask(int):
+    """
+    The survivors still trapped, as an int bitmask (bit i set = survivor i
+    of the problem is still waiting). It hashes and compares as a plain int,
+    so hashing a search state is O(1).
+
+    Each MultiSurvivorProblem makes its own subclass holding the survivor
+    positions, which gives the mask the read-only Grid methods (asList,
+    count, mask[x][y]) that heuristics written for survivor Grids rely on.
+    Masks pickle as plain ints.
+    """
+
+    __slots__ = ()
+    positions = ()  # Survivor i is at positions[i]
+    bits = {}  # (x, y) -> 1 << i
+
+    def asList(self, key=True):
+        return [pos for i, pos in enumerate(self.positions) if (self >> i) & 1]
+
+    def count(self, item=True):
+        return bin(self).count("1")
+
+    def copy(self):
+        return self
+
+    def __getitem__(self, x):
+        return _MaskColumn(self, x)
+
+    def __reduce__(self):
+        return (int, (int(self),))
+
+
+class _MaskColumn:
+    __slots__ = ("mask", "x")
+
+    def __init__(self, mask, x):
+        self.mask, self.x = mask, x
+
+    def __getitem__(self, y):
+        return bool(self.mask & self.mask.bits.get((self.x, y), 0))
+
+
 class MultiSurvivorProblem(SearchProblem):
     """
     Find a path that rescues all survivors.
 
-    State: (position, survivors_grid)
+    State: (position, survivors)
     - position: (x, y) tuple
-    - survivors_grid: Grid of booleans (True = survivor present)
+    - survivors: SurvivorMask, an int bitmask of the survivors still trapped
+      that also reads like the survivors Grid (asList, count, [x][y])
 
-    Goal: All survivors rescued (survivors_grid.count() == 0)
+    Goal: All survivors rescued (survivors == 0)
+
+    With contract=True, corridors are collapsed into weighted edges whose
+    actions are tuples of Directions (see algorithms/corridors.py).
+    With reduce=True (default), dead ends and unreachable cells are removed
+    from the walls first (see world/layout_reduction.py).
     """
 
-    def __init__(self, startingMissionState: RescueState):
-        self.start = (
-            startingMissionState.getRescuerPosition(),
-            startingMissionState.getSurvivors(),
+    def __init__(
+        self,
+        startingMissionState: RescueState,
+        contract=False,
+        reduce=True,
+        start=None,
+        survivors=None,
+    ):
+        """
+        startingMissionState: RescueState
+        contract: search the corridor-contracted graph (macro actions)
+        reduce: search the reduced layout (see world/layout_reduction.py)
+        start: optional override for the rescuer position
+        survivors: optional subset of the survivors to rescue (sub-instances)
+        """
+        if survivors is None:
+            survivors = startingMissionState.getSurvivorsAsList()
+        survivors = list(survivors)
+        rescuer = startingMissionState.getRescuerPosition()
+        if start is not None:
+            rescuer = tuple(start)
+        self.survivorPositions = survivors
+        self.survivorBits = dict((pos, 1 << i) for i, pos in enumerate(survivors))
+        self.maskType = type(
+            "SurvivorMask",
+            (SurvivorMask,),
+            {"__slots__": (), "positions": tuple(survivors), "bits": self.survivorBits},
         )
+        self.start = (rescuer, self.maskType((1 << len(survivors)) - 1))
+        self.layout = startingMissionState.getLayout()
         self.walls = startingMissionState.getWalls()
         self.startingMissionState = startingMissionState
+        self.terrainCosts = True
+        self.costFn = lambda pos: startingMissionState.getTerrainCost(pos[0], pos[1])
         self._expanded = 0
-        self.heuristicInfo = {}  # For caching heuristic computations
+        self.heuristicInfo = utils.LRUCache()  # For caching heuristic computations (bounded)
+
+        self.reduction = None
+        if reduce:
+            reduction = startingMissionState.getLayout().getReduction()
+            if all(reduction.isFree(pos) for pos in [self.start[0]] + survivors):
+                self.walls = reduction.prunedWalls
+                self.reduction = reduction
+
+        # Survivors are kept as nodes so corridors never rescue anyone midway
+        self.corridors = None
+        if contract:
+            keep = [self.start[0]] + survivors
+            costFn = lambda pos: startingMissionState.getTerrainCost(pos[0], pos[1])
+            self.corridors = CorridorGraph(self.walls, costFn, keep)
+
+        self.adjacency = startingMissionState.getLayout().getAdjacency(self.reduction is not None)
 
     def getStartState(self):
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1] == 0
 
     def getSuccessors(self, state):
         """
@@ -219,22 +373,23 @@ class MultiSurvivorProblem(SearchProblem):
         """
         successors = []
         self._expanded += 1
-
-        for direction in [
-            Directions.NORTH,
-            Directions.SOUTH,
-            Directions.EAST,
-            Directions.WEST,
-        ]:
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-
-            if not self.walls[nextx][nexty]:
-                nextSurvivors = state[1].copy()
-                nextSurvivors[nextx][nexty] = False  # Rescue survivor if present
-                stepCost = self.startingMissionState.getTerrainCost(nextx, nexty)
-                successors.append((((nextx, nexty), nextSurvivors), direction, stepCost))
+        pos, mask = state
+
+        if self.corridors is not None:
+            for nextPos, actions, stepCost in self.corridors.getEdges(pos):
+                bit = self.survivorBits.get(nextPos, 0)
+                nextMask = self.maskType(mask & ~bit) if mask & bit else mask
+                successors.append(((nextPos, nextMask), actions, stepCost))
+            return successors
+
+        adjacency = self.adjacency
+        i = pos[0] * adjacency.height + pos[1]
+        bits = self.survivorBits
+        for nextPos, direction, stepCost in adjacency.edges[adjacency.offsets[i] : adjacency.offsets[i + 1]]:
+            # Rescue survivor if present
+            bit = bits.get(nextPos, 0)
+            nextMask = self.maskType(mask & ~bit) if mask & bit else mask
+            successors.append(((nextPos, nextMask), direction, stepCost))
 
         return successors
 
@@ -245,10 +400,69 @@ class MultiSurvivorProblem(SearchProblem):
         """
         x, y = self.getStartState()[0]
         cost = 0
-        for action in actions:
+        for action in self.expandActions(actions):
             dx, dy = Actions.directionToVector(action)
             x, y = int(x + dx), int(y + dy)
             if self.walls[x][y]:
                 return 999999
             cost += self.startingMissionState.getTerrainCost(x, y)
         return cost
+
+
+class MacroSurvivorProblem(MultiSurvivorProblem):
+    """
+    MultiSurvivorProblem with one macro action per remaining survivor:
+    from a state, each successor walks straight to a survivor j along a
+    cheapest path (see SurvivorDistanceMatrix), at its exact maze cost.
+    Search depth drops from the path length to the number of survivors.
+
+    States are the same (position, SurvivorMask) pairs; the position is
+    always the start or a survivor cell. A path that walks over other
+    survivors rescues them too, and a move to j is only offered when no
+    other remaining survivor lies on its path (going there first reaches
+    the same state at the same cost). Actions are tuples of Directions,
+    expanded back by expandActions.
+    """
+
+    def __init__(self, startingMissionState: RescueState, reduce=True, start=None, survivors=None):
+        MultiSurvivorProblem.__init__(
+            self, startingMissionState, reduce=reduce, start=start, survivors=survivors
+        )
+        matrix = getSurvivorDistances(self)
+        self.matrix = matrix
+        self.pointIndex = dict((pos, i) for i, pos in reversed(list(enumerate(matrix.points))))
+
+        # covers[i][j]: mask of the survivors rescued walking points[i] -> points[j]
+        self.covers = []
+        for i, source in enumerate(matrix.points):
+            row = []
+            for j in range(len(matrix.points)):
+                covered = 0
+                path = matrix.path(i, j)
+                if path is not None and j > 0:
+                    covered = self.survivorBits[matrix.points[j]]
+                    x, y = source
+                    for action in path:
+                        dx, dy = Actions.directionToVector(action)
+                        x, y = int(x + dx), int(y + dy)
+                        covered |= self.survivorBits.get((x, y), 0)
+                row.append(covered)
+            self.covers.append(row)
+
+    def getSuccessors(self, state):
+        """
+        Returns one (successor, actions, cost) per remaining survivor that
+        can be reached without walking over another remaining survivor.
+        """
+        successors = []
+        self._expanded += 1
+        pos, mask = state
+        i = self.pointIndex[pos]
+        covers = self.covers[i]
+        for j in range(1, len(self.matrix.points)):
+            bit = 1 << (j - 1)
+            if not mask & bit or covers[j] & mask != bit:
+                continue
+            nextState = (self.matrix.points[j], self.maskType(mask & ~covers[j]))
+            successors.append((nextState, self.matrix.path(i, j), self.matrix.distance(i, j)))
+        return successors
@@ -0,0 +1,64 @@
+class DominancePruner:
+    """
+    Pruning layer for searches over (position, survivors mask) states, as in
+    MultiSurvivorProblem and MacroSurvivorProblem.
+
+    A state (p, M) reached at cost g is dominated by (p, M') reached at
+    g' <= g when M' is a subset of M: the second rescuer stands on the same
+    cell with no more survivors left, so anything the first can still do it
+    can do at no greater cost. Each position keeps its Pareto set of
+    (mask, g) pairs that no other pair dominates; a new pair is rejected if
+    dominated and otherwise evicts the pairs it dominates.
+
+    Rules, each with its own counter in pruned:
+    - "reversal": stepping straight back to the parent state (a detour
+      that rescued nobody), rejected without looking at the Pareto set
+    - "dominated": a generated state dominated by a recorded one
+    - "superseded": a state that was recorded and queued, then dominated
+      by a later one before it was expanded
+    """
+
+    def __init__(self):
+        self.pareto = {}  # position -> {mask: g}
+        self.pruned = {"reversal": 0, "dominated": 0, "superseded": 0}
+
+    def admit(self, state, g, parent=None):
+        """
+        Records state at cost g and returns True, or returns False (and
+        counts why) if it is pruned.
+        """
+        if state == parent:
+            self.pruned["reversal"] += 1
+            return False
+        pos, mask = state
+        mask = int(mask)
+        entries = self.pareto.setdefault(pos, {})
+        same = entries.get(mask)
+        if same is not None and same <= g:
+            self.pruned["dominated"] += 1
+            return False
+        evicted = []
+        for other, otherCost in entries.items():
+            if otherCost <= g and other & ~mask == 0:
+                self.pruned["dominated"] += 1
+                return False
+            if g <= otherCost and mask & ~other == 0:
+                evicted.append(other)
+        for other in evicted:
+            del entries[other]
+        entries[mask] = g
+        return True
+
+    def isCurrent(self, state, g):
+        """
+        Returns True if state at cost g is still in its Pareto set (call
+        when popping it from the frontier).
+        """
+        pos, mask = state
+        if self.pareto.get(pos, {}).get(int(mask)) == g:
+            return True
+        self.pruned["superseded"] += 1
+        return False
+
+    def report(self):
+        return ", ".join("%s %d" % (rule, count) for rule, count in self.pruned.items())
@@ -0,0 +1,158 @@
+import heapq
+from world.game import Actions, MOVE_VECTORS
+
+INF = float("inf")
+
+
+class DStarLite:
+    """
+    D* Lite (Koenig & Likhachev) over the terrain-weighted grid of a layout.
+
+    The search runs backward from the goals (every goal has rhs = 0), so the
+    g-values are costs-to-go that stay valid while the rescuer moves. When a
+    cell changes (terrain cost or wall), only the vertices whose rhs depends
+    on that cell are updated and the repair spreads no further than the
+    g-values it actually changes, so replanning work is proportional to the
+    affected region instead of the whole map.
+
+    Moving into a cell costs its terrain cost; walls cost infinity.
+    """
+
+    def __init__(self, layout, start, goals):
+        """
+        layout: RescueLayout (can be replaced with a newer version later)
+        start: rescuer position
+        goals: cells to reach (the nearest one is targeted)
+        """
+        self.layout = layout
+        self.start = start
+        self.last = start
+        self.goals = set(goals)
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.heap = []
+        self.keys = {}  # Vertex -> key of its live heap entry (others are stale)
+        self.expanded = 0
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self._push(goal, self._calculateKey(goal))
+
+    def _cost(self, u, v):
+        if self.layout.isWall(u) or self.layout.isWall(v):
+            return INF
+        return self.layout.getTerrainCost(*v)
+
+    def _neighbors(self, u):
+        x, y = u
+        neighbors = []
+        for dx, dy in MOVE_VECTORS:
+            nextx, nexty = x + dx, y + dy
+            if 0 <= nextx < self.layout.width and 0 <= nexty < self.layout.height:
+                neighbors.append((nextx, nexty))
+        return neighbors
+
+    def _h(self, a, b):
+        # Every move costs at least 1, so Manhattan distance is admissible
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _calculateKey(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self._h(self.start, s) + self.km, m)
+
+    def _push(self, s, key):
+        self.keys[s] = key
+        heapq.heappush(self.heap, (key, s))
+
+    def _topKey(self):
+        while self.heap and self.keys.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return (INF, INF)
+        return self.heap[0][0]
+
+    def _updateVertex(self, u):
+        if u not in self.goals:
+            best = INF
+            for v in self._neighbors(u):
+                cost = self._cost(u, v)
+                if cost < INF:
+                    best = min(best, cost + self.g.get(v, INF))
+            self.rhs[u] = best
+        self.keys.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u, self._calculateKey(u))
+
+    def computeShortestPath(self):
+        """
+        Expands inconsistent vertices until the start is consistent.
+        Returns the number of vertices expanded by this call.
+        """
+        expanded = 0
+        while True:
+            top = self._topKey()
+            startConsistent = self.rhs.get(self.start, INF) == self.g.get(self.start, INF)
+            if top == (INF, INF) or (startConsistent and top >= self._calculateKey(self.start)):
+                break
+            kold, u = heapq.heappop(self.heap)
+            del self.keys[u]
+            expanded += 1
+            knew = self._calculateKey(u)
+            if kold < knew:
+                self._push(u, knew)
+            elif self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for p in self._neighbors(u):
+                    self._updateVertex(p)
+            else:
+                self.g[u] = INF
+                self._updateVertex(u)
+                for p in self._neighbors(u):
+                    self._updateVertex(p)
+        self.expanded += expanded
+        return expanded
+
+    def moveTo(self, pos):
+        """
+        Tells the planner the rescuer is now at pos.
+        """
+        if pos != self.start:
+            self.km += self._h(self.last, pos)
+            self.last = pos
+            self.start = pos
+
+    def cellChanged(self, cell):
+        """
+        Notifies the planner that the wall or terrain of cell changed in
+        self.layout. Edges into and out of cell are the only ones affected.
+        """
+        self._updateVertex(cell)
+        for p in self._neighbors(cell):
+            self._updateVertex(p)
+
+    def removeGoal(self, goal):
+        """
+        Stops targeting goal (e.g. that survivor has been rescued).
+        """
+        if goal in self.goals:
+            self.goals.discard(goal)
+            self._updateVertex(goal)
+
+    def costToGo(self):
+        return self.g.get(self.start, INF)
+
+    def nextAction(self):
+        """
+        Returns the first move of a cheapest path from the start to a goal,
+        or None if the start is a goal or no goal is reachable.
+        """
+        self.computeShortestPath()
+        if self.start in self.goals or self.costToGo() == INF:
+            return None
+        best, bestAction = INF, None
+        for v in self._neighbors(self.start):
+            value = self._cost(self.start, v) + self.g.get(v, INF)
+            if value < best:
+                best = value
+                bestAction = Actions.vectorToDirection((v[0] - self.start[0], v[1] - self.start[1]))
+        return bestAction
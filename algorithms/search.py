@@ -1,9 +1,21 @@
-from algorithms.problems import SearchProblem
+from algorithms.problems import SearchProblem, MultiSurvivorProblem
 import algorithms.utils as utils
-from world.game import Directions
-from algorithms.heuristics import nullHeuristic
+from world.game import Directions, Actions
+from algorithms.heuristics import nullHeuristic, manhattanHeuristic, manhattanSurvivorHeuristic
 from algorithms.utils import Stack
 from algorithms.utils import PriorityQueue
+from algorithms.hierarchy import getHierarchy
+from algorithms.distances import getCostToGo, getSurvivorDistances, mstCost
+from algorithms.pruning import DominancePruner
+from algorithms.tours import PlannerLimitError, heldKarpBytes, heldKarpPath
+from algorithms.decomposition import CutDecomposition
+from world.rescue_layout import RescueLayout
+from world.rescue_state import RescueState
+import numpy as np
+import heapq
+import random
+import threading
+import time
 
 
 def tinyHouseSearch(problem: SearchProblem):
@@ -168,8 +180,630 @@ def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
     return []
 
 
+def contractionHierarchySearch(problem: SearchProblem):
+    """
+    Answers a SimpleSurvivorProblem with a Contraction Hierarchy query.
+
+    The hierarchy of the building is built once (or loaded from the disk
+    cache) and every later start/goal pair on the same layout only runs a
+    small bidirectional upward search. Uses the layout terrain costs, so it
+    is only valid with the default costFn. In multi-goal mode every goal is
+    queried and the cheapest answer is kept.
+    """
+    ch = getHierarchy(problem.layout)
+    best, bestActions = None, []
+    problem._expanded = 0
+    for goal in problem.goals:
+        cost, actions = ch.query(problem.getStartState(), goal)
+        problem._expanded += ch.lastSettled
+        if actions is not None and (best is None or cost < best):
+            best, bestActions = cost, actions
+    return bestActions
+
+
+def costToGoSearch(problem: SearchProblem):
+    """
+    Plans a SimpleSurvivorProblem by walking the policy of the cost-to-go
+    field toward the goal. The field is computed once per goal, so every
+    later start position only costs O(path length).
+    """
+    actions = getCostToGo(problem).plan(problem.getStartState())
+    if actions is None:
+        return []
+    return actions
+
+
+def streamingAStarSearch(problem: SearchProblem, heuristic=nullHeuristic, onPrefix=None, weight=1.0):
+    """
+    A* that reports, while it is still searching, the part of the plan that
+    can no longer change.
+
+    Every plan the search can still return extends the path to one of the
+    nodes currently in the frontier, so the longest common prefix of those
+    paths is a prefix of the final plan. With weight=1 and an admissible
+    heuristic the final plan is optimal, so that prefix is part of an optimal
+    plan; with weight>1 (weighted A*) it is part of a plan costing at most
+    weight times the optimum. Each time the prefix grows, onPrefix(actions)
+    is called with it, so an agent can start moving before planning ends.
+    """
+    frontera = utils.PriorityQueue()
+    start = problem.getStartState()
+    frontera.push((start, [], 0), weight * heuristic(start, problem))
+    best_cost = {start: 0}
+    publicado = 0
+    expandidos = 0
+    revisar_cada = 16
+
+    while not frontera.isEmpty():
+        state, actions, curr_cost = frontera.pop()
+
+        if curr_cost != best_cost.get(state, float("inf")):
+            continue
+
+        if problem.isGoalState(state):
+            return actions
+
+        for succ, action, stepCost in problem.getSuccessors(state):
+            nuevo_cost = curr_cost + stepCost
+            if nuevo_cost < best_cost.get(succ, float("inf")):
+                best_cost[succ] = nuevo_cost
+                prioridad = nuevo_cost + weight * heuristic(succ, problem)
+                frontera.push((succ, actions + [action], nuevo_cost), prioridad)
+
+        expandidos += 1
+        if onPrefix is not None and expandidos % revisar_cada == 0:
+            prefijo = _commonFrontierPrefix(frontera, best_cost)
+            if prefijo is not None and len(prefijo) > publicado:
+                publicado = len(prefijo)
+                onPrefix(prefijo)
+            revisar_cada = min(revisar_cada * 2, 1024)
+    return []
+
+
+def _commonFrontierPrefix(frontera, best_cost):
+    """
+    Longest common prefix of the action lists of the live frontier entries.
+    """
+    prefijo = None
+    for _, _, (state, actions, cost) in frontera.heap:
+        if cost != best_cost.get(state):
+            continue  # Stale entry, superseded by a cheaper path
+        if prefijo is None:
+            prefijo = actions
+            continue
+        n = 0
+        limite = min(len(prefijo), len(actions))
+        while n < limite and prefijo[n] == actions[n]:
+            n += 1
+        prefijo = prefijo[:n]
+        if n == 0:
+            break
+    return prefijo
+
+
+def heldKarpSearch(problem: SearchProblem, maxMemoryMB=2048):
+    """
+    Plans a MultiSurvivorProblem exactly with the Held-Karp bitmask DP
+    (heldKarpPath in algorithms/tours.py) over the survivor distance matrix
+    (see getSurvivorDistances). The tables take O(2^k k) memory, so their
+    size is printed and checked against maxMemoryMB before anything is
+    allocated; up to about 20 survivors fit. Past the limit it falls back
+    to cutDecompositionSearch (still exact when every region fits), and
+    then to anytimeTourSearch.
+    """
+    matrix = getSurvivorDistances(problem)
+    k = len(matrix.points) - 1
+    if k == 0:
+        return []
+    print(
+        "[heldKarpSearch] %d survivors, %d subsets, about %.1f MB of tables"
+        % (k, 1 << k, heldKarpBytes(k) / 2.0 ** 20)
+    )
+    try:
+        order = _heldKarpOrder(matrix, maxMemoryMB)
+    except PlannerLimitError as e:
+        print("[heldKarpSearch] %s; falling back to cutDecompositionSearch" % e)
+        try:
+            return cutDecompositionSearch(problem, maxMemoryMB)
+        except PlannerLimitError as e:
+            print("[heldKarpSearch] %s; falling back to anytimeTourSearch" % e)
+            return anytimeTourSearch(problem)
+    if order is None:
+        return []
+    return _stitchTour(problem, matrix, order)
+
+
+def _heldKarpOrder(matrix, maxMemoryMB=2048, last=None):
+    """
+    Returns the optimal survivor visiting order (0-based survivor indices)
+    for a SurvivorDistanceMatrix, or None if some survivor is unreachable.
+    With last set, only orders ending at that survivor are considered.
+    """
+    endCost = None
+    if last is not None:
+        endCost = np.full(len(matrix.points) - 1, np.inf)
+        endCost[last] = 0
+    return heldKarpPath(matrix.dist, endCost, maxMemoryMB)[1]
+
+
+def _stitchTour(problem, matrix, order):
+    """
+    Joins the path fragments of matrix that visit the survivors in order
+    (survivor indices, 0-based) into one list of Directions.
+
+    A fragment may walk over survivors later in the order; those are
+    rescued on the way, so they are skipped and the plan stops as soon as
+    the last survivor is rescued, exactly as the mission would.
+    """
+    remaining = set(problem.survivorPositions)
+    actions = []
+    pos = matrix.points[0]
+    current = 0
+    for survivor in order:
+        target = survivor + 1
+        if matrix.points[target] not in remaining:
+            continue
+        for action in matrix.path(current, target):
+            dx, dy = Actions.directionToVector(action)
+            pos = (int(pos[0] + dx), int(pos[1] + dy))
+            actions.append(action)
+            remaining.discard(pos)
+            if not remaining:
+                return actions
+        current = target
+    return actions
+
+
+def anytimeTourSearch(problem: SearchProblem, timeLimit=1.0, seed=0):
+    """
+    Anytime planner for MultiSurvivorProblems with too many survivors for an
+    exact method. Works on the survivor distance matrix:
+    1. A nearest-neighbor tour from the start
+    2. Local search until no move improves it: 2-opt (reverse a stretch),
+       relocate (move one survivor) and Or-opt (move a run of 2-3)
+    3. While time is left, random double-bridge kicks followed by local
+       search again, keeping the best tour (iterated local search), until
+       200 kicks in a row bring nothing
+
+    Stops after timeLimit seconds and reports the gap to an MST lower bound
+    (any walk through every survivor is a spanning tree, and with asymmetric
+    costs each leg costs at least min(d(a, b), d(b, a))).
+    """
+    starttime = time.time()
+    matrix = getSurvivorDistances(problem)
+    dist = matrix.dist
+    k = len(matrix.points) - 1
+    if k == 0:
+        return []
+    if np.isinf(dist[0, 1:]).any():
+        return []
+
+    # Nearest-neighbor tour; tour[0] is the start (point 0)
+    tour = [0]
+    left = set(range(1, k + 1))
+    while left:
+        nearest = min(left, key=lambda j: (dist[tour[-1], j], j))
+        tour.append(nearest)
+        left.remove(nearest)
+    initialCost = _tourCost(dist, tour)
+    tour, cost, moves = _improveTour(dist, tour, starttime + timeLimit)
+
+    rng = random.Random(seed)
+    kicks = stalled = 0
+    while time.time() < starttime + timeLimit and k >= 3 and stalled < 200:
+        kicks += 1
+        stalled += 1
+        a, b, c = sorted(rng.sample(range(1, k + 1), 3))
+        kicked = tour[:a] + tour[b:c] + tour[a:b] + tour[c:]
+        kicked, kickedCost, kickedMoves = _improveTour(dist, kicked, starttime + timeLimit)
+        moves += kickedMoves
+        if kickedCost < cost - 1e-9:
+            tour, cost = kicked, kickedCost
+            stalled = 0
+
+    between = np.minimum(dist, dist.T)
+    lowerBound = mstCost(between)
+    actions = _stitchTour(problem, matrix, [j - 1 for j in tour[1:]])
+    planCost = problem.getCostOfActions(actions)
+    gap = 100.0 * (planCost - lowerBound) / lowerBound if lowerBound > 0 else 0.0
+    print(
+        "[anytimeTourSearch] %d survivors: tour cost %d (nearest neighbor %d) after "
+        "%d improving moves and %d kicks in %.2f s; MST lower bound %d, gap %.1f%%"
+        % (k, planCost, initialCost, moves, kicks, time.time() - starttime, lowerBound, gap)
+    )
+    return actions
+
+
+def _tourCost(dist, tour):
+    return float(sum(dist[tour[i], tour[i + 1]] for i in range(len(tour) - 1)))
+
+
+def _improveTour(dist, tour, deadline):
+    """
+    First-improvement local search on an open tour starting at tour[0]
+    (fixed). Every move is priced in O(1): prefix sums of the forward and
+    backward leg costs give the cost of a reversed stretch under asymmetric
+    distances. Returns (tour, cost, improving moves made).
+    """
+    tour = list(tour)
+    n = len(tour) - 1
+    moves = 0
+    improved = True
+    while improved and time.time() < deadline:
+        improved = False
+        forward = [0.0]
+        backward = [0.0]
+        for i in range(n):
+            forward.append(forward[-1] + dist[tour[i], tour[i + 1]])
+            backward.append(backward[-1] + dist[tour[i + 1], tour[i]])
+
+        # 2-opt: reverse tour[i..j]
+        for i in range(1, n):
+            for j in range(i + 1, n + 1):
+                delta = (
+                    dist[tour[i - 1], tour[j]]
+                    - dist[tour[i - 1], tour[i]]
+                    + (backward[j] - backward[i])
+                    - (forward[j] - forward[i])
+                )
+                if j < n:
+                    delta += dist[tour[i], tour[j + 1]] - dist[tour[j], tour[j + 1]]
+                if delta < -1e-9:
+                    tour[i : j + 1] = tour[i : j + 1][::-1]
+                    improved = True
+                    break
+            if improved:
+                break
+        if improved:
+            moves += 1
+            continue
+
+        # Relocate (length 1) and Or-opt (length 2-3): move tour[i..i+length-1] after tour[p]
+        for length in (1, 2, 3):
+            for i in range(1, n - length + 2):
+                first, last = tour[i], tour[i + length - 1]
+                prev = tour[i - 1]
+                nxt = tour[i + length] if i + length <= n else None
+                removeGain = dist[prev, first]
+                if nxt is not None:
+                    removeGain += dist[last, nxt] - dist[prev, nxt]
+                for p in range(0, n + 1):
+                    if i - 1 <= p <= i + length - 1:
+                        continue
+                    a = tour[p]
+                    b = tour[p + 1] if p < n else None
+                    insertCost = dist[a, first]
+                    if b is not None:
+                        insertCost += dist[last, b] - dist[a, b]
+                    if insertCost - removeGain < -1e-9:
+                        segment = tour[i : i + length]
+                        rest = tour[:i] + tour[i + length :]
+                        at = rest.index(a) + 1
+                        tour = rest[:at] + segment + rest[at:]
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+        if improved:
+            moves += 1
+    return tour, _tourCost(dist, tour), moves
+
+
+def clusterTourSearch(problem: SearchProblem, clusterSize=10, workers=None, polishTime=0.25):
+    """
+    Cluster-first, route-second planner for MultiSurvivorProblems with very
+    many survivors:
+    1. The survivors are split into groups of about clusterSize with
+       k-medoids over the (symmetrized) survivor distance matrix; groups
+       over 1.5 x clusterSize are split again
+    2. The clusters are ordered by a tour over their medoids from the start
+       (nearest neighbor + local search, see anytimeTourSearch)
+    3. Consecutive clusters are joined through their closest pair of
+       members, which fixes where each cluster is entered and left. Each
+       cluster is then solved exactly as its own MultiSurvivorProblem
+       (Held-Karp from its entry, ending at its exit). The sub-instances
+       are independent and are solved in parallel processes (workers,
+       default one per CPU) when more than one is available
+    4. The visiting orders are concatenated, polished for polishTime
+       seconds with the local search of anytimeTourSearch (this mostly
+       repairs the seams between clusters) and stitched into one plan
+
+    With a bounded cluster size the work grows linearly with the number of
+    survivors. The result is not optimal.
+    """
+    starttime = time.time()
+    matrix = getSurvivorDistances(problem)
+    k = len(matrix.points) - 1
+    if k == 0:
+        return []
+    if np.isinf(matrix.dist[0, 1:]).any():
+        return []
+    between = np.minimum(matrix.dist, matrix.dist.T)
+
+    # k-medoids does not bound cluster sizes, so oversized clusters are split again
+    clusters = []
+    pending = [list(range(1, k + 1))]
+    while pending:
+        items = pending.pop()
+        for medoid, members in _kMedoids(between, items, -(-len(items) // clusterSize)):
+            if len(members) > clusterSize * 3 // 2 and len(members) < len(items):
+                pending.append(members)
+            else:
+                clusters.append((medoid, members))
+    medoids = [medoid for medoid, members in clusters]
+
+    # Order the clusters by a tour over the medoids (point 0 = the start)
+    points = [0] + medoids
+    medoidDist = matrix.dist[np.ix_(points, points)]
+    tour = [0]
+    left = set(range(1, len(points)))
+    while left:
+        nearest = min(left, key=lambda j: (medoidDist[tour[-1], j], j))
+        tour.append(nearest)
+        left.remove(nearest)
+    tour = _improveTour(medoidDist, tour, starttime + 1.0)[0]
+    ordered = [clusters[j - 1] for j in tour[1:]]
+
+    # Each cluster is entered and left through the closest pair of members
+    # with its neighbors in the order, which fixes every sub-instance up front
+    entries, exits = [], []
+    previous = [0]
+    for medoid, members in ordered:
+        leaving = previous
+        if exits and len(previous) > 1:
+            leaving = [a for a in previous if a != entries[-1]]
+        a, b = min(
+            ((a, b) for a in leaving for b in members),
+            key=lambda pair: (matrix.dist[pair], pair),
+        )
+        if exits:
+            exits[-1] = a
+        entries.append(b)
+        exits.append(None)
+        previous = members
+    jobs = []
+    for (medoid, members), entry, exit in zip(ordered, entries, exits):
+        rest = [matrix.points[j] for j in members if j != entry]
+        end = matrix.points[exit] if exit is not None and exit != entry else None
+        jobs.append((matrix.points[entry], rest, end))
+
+    layoutText = problem.startingMissionState.getLayout().layoutText
+    orders, workers = utils.parallelMap(_solveCluster, [(layoutText,) + job for job in jobs], workers)
+
+    index = dict((pos, i) for i, pos in enumerate(matrix.points))
+    order = []
+    for (entry, rest, end), clusterOrder in zip(jobs, orders):
+        order.append(index[entry] - 1)
+        order.extend(index[pos] - 1 for pos in clusterOrder)
+    tour = _improveTour(matrix.dist, [0] + [j + 1 for j in order], time.time() + polishTime)[0]
+    actions = _stitchTour(problem, matrix, [j - 1 for j in tour[1:]])
+    print(
+        "[clusterTourSearch] %d survivors in %d clusters (largest %d), %d worker(s): "
+        "cost %d in %.2f s"
+        % (
+            k,
+            len(clusters),
+            max(len(members) for medoid, members in clusters),
+            workers,
+            problem.getCostOfActions(actions),
+            time.time() - starttime,
+        )
+    )
+    return actions
+
+
+def _kMedoids(dist, items, count, iterations=20):
+    """
+    Splits items (indices into dist) into count clusters around medoids.
+    Seeds by farthest-point selection, then alternates assigning every item
+    to its nearest medoid and moving each medoid to the member with the
+    smallest total distance to the others. Returns [(medoid, members)].
+    """
+    count = max(1, min(count, len(items)))
+    medoids = [items[0]]
+    while len(medoids) < count:
+        medoids.append(max(items, key=lambda i: min(dist[i, m] for m in medoids)))
+    for _ in range(iterations):
+        members = dict((m, []) for m in medoids)
+        for i in items:
+            members[min(medoids, key=lambda m: (dist[i, m], m))].append(i)
+        updated = [
+            min(group, key=lambda c: sum(dist[c, i] for i in group))
+            for group in members.values()
+            if group
+        ]
+        if sorted(updated) == sorted(medoids):
+            break
+        medoids = updated
+    members = dict((m, []) for m in medoids)
+    for i in items:
+        members[min(medoids, key=lambda m: (dist[i, m], m))].append(i)
+    return [(m, group) for m, group in members.items() if group]
+
+
+def _solveCluster(job):
+    """
+    Solves one cluster of clusterTourSearch (runs in a worker process).
+    job is (layoutText, start, survivors, end); returns the survivors in the
+    optimal order to rescue them from start, finishing at end if given.
+    """
+    layoutText, start, survivors, end = job
+    state = RescueState()
+    state.initialize(RescueLayout(layoutText))
+    problem = MultiSurvivorProblem(state, start=start, survivors=survivors)
+    matrix = getSurvivorDistances(problem)
+    last = None if end is None else survivors.index(end)
+    order = _heldKarpOrder(matrix, last=last) or []
+    return [matrix.points[j + 1] for j in order]
+
+
+def dominanceAStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
+    """
+    A* for multi-survivor problems ((position, survivors mask) states) with
+    the DominancePruner layer: states dominated by another one on the same
+    cell (no more survivors left, no higher cost) are never queued, and
+    immediate reversals are dropped. Optimal with an admissible heuristic,
+    since a dominating state can always finish at least as cheaply.
+    Prints how many nodes each rule pruned.
+    """
+    pruner = DominancePruner()
+    frontera = utils.PriorityQueue()
+    start = problem.getStartState()
+    pruner.admit(start, 0)
+    # Nodes are (state, cost, action, parent node)
+    frontera.push((start, 0, None, None), heuristic(start, problem))
+
+    while not frontera.isEmpty():
+        node = frontera.pop()
+        state, curr_cost, _, parent = node
+        if not pruner.isCurrent(state, curr_cost):
+            continue
+
+        if problem.isGoalState(state):
+            acciones = []
+            while node[3] is not None:
+                acciones.append(node[2])
+                node = node[3]
+            acciones.reverse()
+            print("[dominanceAStarSearch] pruned: " + pruner.report())
+            return acciones
+
+        parentState = parent[0] if parent is not None else None
+        for succ, action, stepCost in problem.getSuccessors(state):
+            nuevo_cost = curr_cost + stepCost
+            if pruner.admit(succ, nuevo_cost, parentState):
+                prioridad = nuevo_cost + heuristic(succ, problem)
+                frontera.push((succ, nuevo_cost, action, node), prioridad)
+
+    print("[dominanceAStarSearch] pruned: " + pruner.report())
+    return []
+
+
+def cutDecompositionSearch(problem: SearchProblem, maxMemoryMB=2048):
+    """
+    Plans a MultiSurvivorProblem exactly by splitting it at articulation
+    points (see CutDecomposition): wings that hang off a single doorway are
+    solved on their own and combined, so each Held-Karp only sees the
+    survivors and doorways of one region.
+    """
+    decomposition = CutDecomposition(problem, maxMemoryMB)
+    cost, order = decomposition.solve()
+    print(
+        "[cutDecompositionSearch] %d articulation points, %d wings split off, "
+        "largest region %d points, cost %s"
+        % (
+            len(decomposition.articulationPoints),
+            decomposition.wings,
+            decomposition.largestRegion,
+            cost,
+        )
+    )
+    if order is None:
+        return []
+    matrix = getSurvivorDistances(problem)
+    index = dict((pos, i) for i, pos in enumerate(problem.survivorPositions))
+    return _stitchTour(problem, matrix, [index[pos] for pos in order])
+
+
+def hotSwapAStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
+    """
+    A* that starts right away with a Manhattan heuristic while a background
+    thread evaluates heuristic once on the start state, which builds its
+    tables (cost-to-go fields, distance matrices, landmarks, pattern
+    databases) in problem.heuristicInfo.
+
+    When the thread is done, the frontier is re-keyed in place: every queued
+    node gets g + max(Manhattan, heuristic), and so does every node pushed
+    later. Both are admissible, so the max is too. Like aStarSearch, a state
+    reached again at a lower cost is queued again (reopened), so the result
+    stays optimal across the switch.
+
+    The builder is a thread, not a process, because the tables have to end
+    up in this problem's heuristicInfo. Most builders are pure Python, so
+    they share the GIL with the search: the two interleave rather than run
+    in parallel, and the search slows down until the switch. Only builders
+    that hand work to a process pool (pattern database groups) or load
+    their tables from the disk cache really overlap with the search.
+    """
+    if isinstance(problem, MultiSurvivorProblem):
+        cheap = manhattanSurvivorHeuristic
+    else:
+        cheap = manhattanHeuristic
+    start = problem.getStartState()
+    failure = []
+
+    def build():
+        try:
+            heuristic(start, problem)
+        except Exception as e:
+            failure.append(e)
+
+    builder = threading.Thread(target=build, daemon=True)
+    builder.start()
+    current = cheap
+    swapped = False
+
+    frontera = utils.PriorityQueue()
+    # Nodes are (state, cost, action, parent node)
+    frontera.push((start, 0, None, None), current(start, problem))
+    best_cost = {start: 0}
+    expandidos = 0
+
+    while not frontera.isEmpty():
+        if not swapped and not builder.is_alive():
+            swapped = True
+            if failure:
+                print("[hotSwapAStarSearch] heuristic failed (%s); keeping Manhattan" % failure[0])
+            else:
+                current = lambda state, problem: max(cheap(state, problem), heuristic(state, problem))
+                frontera.heap = [
+                    (node[1] + current(node[0], problem), count, node)
+                    for _, count, node in frontera.heap
+                    if node[1] == best_cost.get(node[0])
+                ]
+                heapq.heapify(frontera.heap)
+                print(
+                    "[hotSwapAStarSearch] switched heuristic after %d expansions, re-keyed %d frontier nodes"
+                    % (expandidos, len(frontera.heap))
+                )
+
+        node = frontera.pop()
+        state, curr_cost, _, _ = node
+        if curr_cost != best_cost.get(state, float("inf")):
+            continue
+
+        if problem.isGoalState(state):
+            acciones = []
+            while node[3] is not None:
+                acciones.append(node[2])
+                node = node[3]
+            acciones.reverse()
+            if not swapped:
+                print("[hotSwapAStarSearch] finished after %d expansions, before the heuristic was ready" % expandidos)
+            return acciones
+
+        expandidos += 1
+        for succ, action, stepCost in problem.getSuccessors(state):
+            nuevo_cost = curr_cost + stepCost
+            if nuevo_cost < best_cost.get(succ, float("inf")):
+                best_cost[succ] = nuevo_cost
+                prioridad = nuevo_cost + current(succ, problem)
+                frontera.push((succ, nuevo_cost, action, node), prioridad)
+    return []
+
+
 # Abbreviations (you can use them for the -f option in main.py)
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+chs = contractionHierarchySearch
+sastar = streamingAStarSearch
+hks = heldKarpSearch
+ats = anytimeTourSearch
+cts = clusterTourSearch
+dastar = dominanceAStarSearch
+cds = cutDecompositionSearch
+hsastar = hotSwapAStarSearch
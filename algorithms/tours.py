@@ -0,0 +1,81 @@
+import numpy as np
+
+
+class PlannerLimitError(MemoryError):
+    """
+    Raised when an exact planner's tables would exceed its memory limit
+    (maxMemoryMB), before anything is allocated.
+    """
+
+
+def heldKarpBytes(k):
+    """
+    Memory the Held-Karp tables take for k points besides the start.
+    """
+    return (1 << k) * k * (8 + 1)  # float64 costs + int8 predecessors
+
+
+def heldKarpPath(dist, endCost=None, maxMemoryMB=2048):
+    """
+    Exact cheapest walk from point 0 that visits every other point of the
+    (k+1)x(k+1) cost matrix dist, by the Held-Karp bitmask DP.
+
+    best[M, j] is the cheapest walk from point 0 that first visits the
+    points in mask M (bit j = point j + 1) and ends at point j + 1. The
+    masks are filled one subset size at a time with numpy, each layer
+    reading the previous one. endCost[j] is added when the walk ends at
+    point j + 1 (e.g. the way back for a closed tour, or np.inf to forbid
+    ending there).
+
+    Returns (cost, order) with order the points 1..k as 0-based indices
+    j, or (np.inf, None) if no walk exists. Time is O(2^k k^2) and memory
+    O(2^k k); the table size is checked against maxMemoryMB first, and
+    PlannerLimitError is raised if it does not fit.
+    """
+    dist = np.asarray(dist)
+    k = len(dist) - 1
+    if k == 0:
+        return 0.0, []
+    bytesNeeded = heldKarpBytes(k)
+    if bytesNeeded > maxMemoryMB * 2 ** 20:
+        raise PlannerLimitError(
+            "Held-Karp needs about %.0f MB for %d survivors (limit %d MB)"
+            % (bytesNeeded / 2.0 ** 20, k, maxMemoryMB)
+        )
+
+    size = 1 << k
+    between = dist[1:, 1:]
+    best = np.full((size, k), np.inf)
+    parent = np.full((size, k), -1, dtype=np.int8)
+    for j in range(k):
+        best[1 << j, j] = dist[0, j + 1]
+
+    masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.int8)
+    for bit in range(k):
+        popcount += (masks >> bit) & 1
+
+    for subsetSize in range(2, k + 1):
+        layer = masks[popcount == subsetSize]
+        for j in range(k):
+            ending = layer[(layer >> j) & 1 == 1]
+            previous = ending ^ (1 << j)
+            # best[previous, i] is inf for every i outside previous
+            candidates = best[previous] + between[:, j]
+            choice = np.argmin(candidates, axis=1)
+            best[ending, j] = candidates[np.arange(len(ending)), choice]
+            parent[ending, j] = choice
+
+    full = size - 1
+    final = best[full] if endCost is None else best[full] + np.asarray(endCost, dtype=np.float64)
+    last = int(np.argmin(final))
+    if final[last] == np.inf:
+        return np.inf, None
+
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last)
+        mask, last = mask ^ (1 << last), int(parent[mask, last])
+    order.reverse()
+    return float(final[order[-1]]), order
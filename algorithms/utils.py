@@ -1,6 +1,13 @@
 import sys
+import os
 import inspect
 import heapq
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+CACHE_DIR = "cache"  # Where precomputed per-layout tables are persisted
+HEURISTIC_CACHE_SIZE = 100000  # Default entry limit of LRUCache (set with --heuristicCacheSize)
 
 
 class Stack:
@@ -120,6 +127,96 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class LRUCache:
+    """
+    A dictionary with a bounded number of entries for heuristic caches
+    (problem.heuristicInfo). When full, the least recently used entry is
+    evicted. Entries stored with pin() (precomputed tables) are never
+    evicted and do not count toward the limit.
+
+    hits, misses and evictions count lookups with get, setdefault and [],
+    and entries dropped to make room. Membership tests (in) are not
+    counted, so "if key in cache: cache[key]" counts as one lookup.
+    """
+
+    def __init__(self, maxSize=None):
+        """
+        maxSize: entry limit (default HEURISTIC_CACHE_SIZE; None or 0 = unbounded)
+        """
+        if maxSize is None:
+            maxSize = HEURISTIC_CACHE_SIZE
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.pinned = {}
+        self.hits = self.misses = self.evictions = 0
+
+    def __getitem__(self, key):
+        if key in self.pinned:
+            self.hits += 1
+            return self.pinned[key]
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.pinned:
+            self.pinned[key] = value
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.maxSize and len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self.pinned or key in self.entries
+
+    def __delitem__(self, key):
+        if key in self.pinned:
+            del self.pinned[key]
+        else:
+            del self.entries[key]
+
+    def __len__(self):
+        return len(self.entries) + len(self.pinned)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def pin(self, key, value):
+        """
+        Stores value under key for good (never evicted) and returns it.
+        """
+        self.entries.pop(key, None)
+        self.pinned[key] = value
+        return value
+
+    def report(self):
+        return "%d hits, %d misses, %d evictions, %d entries (limit %s) + %d pinned" % (
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self.entries),
+            self.maxSize or "none",
+            len(self.pinned),
+        )
+
+
 class Counter(dict):
     """
     A counter keeps track of counts for a set of keys.
@@ -358,3 +455,52 @@ def nearestPoint(pos):
     grid_row = int(current_row + 0.5)
     grid_col = int(current_col + 0.5)
     return (grid_row, grid_col)
+
+
+def cachePath(kind, fingerprint):
+    """
+    Returns the file path for a persisted table of the given kind
+    (e.g. "ch", "landmarks") built for the layout with this fingerprint.
+    """
+    return os.path.join(CACHE_DIR, "%s-%s.pkl" % (kind, fingerprint))
+
+
+def parallelMap(fn, items, workers=None):
+    """
+    Returns ([fn(item) for item in items], number of processes used),
+    computed in a process pool of up to workers processes (default: one
+    per CPU). fn must be a module-level function so it pickles. Where
+    processes cannot be started, the items are mapped one by one here.
+    """
+    items = list(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(items))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(fn, items)), workers
+        except (OSError, BrokenProcessPool):
+            pass  # No processes here; map them one by one
+    return [fn(item) for item in items], 1
+
+
+def loadOrBuild(path, build, load, save):
+    """
+    Loads a table from path, or builds it and saves it there.
+
+    A missing, unreadable or stale file simply triggers a rebuild, and a
+    failure to write the cache never fails the caller.
+    """
+    if os.path.exists(path):
+        try:
+            return load(path)
+        except Exception as e:
+            print("Ignoring cache file %s (%s)" % (path, e))
+    table = build()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        save(table, path)
+    except OSError as e:
+        print("Could not write cache file %s (%s)" % (path, e))
+    return table
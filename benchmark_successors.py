@@ -0,0 +1,80 @@
+"""
+Successor generation throughput, with and without the compiled adjacency.
+
+USAGE:      python benchmark_successors.py -l LAYOUT [-n REPEATS]
+EXAMPLE:    python benchmark_successors.py -l bigCollapsedBuilding -n 20
+"""
+import sys
+import time
+from optparse import OptionParser
+
+import world.rescue_layout as rescue_layout
+from algorithms.problems import SimpleSurvivorProblem, MultiSurvivorProblem
+from world.game import Actions, MOVES
+from world.rescue_state import RescueState
+
+
+def legacyMultiSuccessors(problem, state):
+    """
+    MultiSurvivorProblem successors computed per call, the way they were
+    before the adjacency table (reference for the benchmark).
+    """
+    successors = []
+    pos, mask = state
+    for direction in MOVES:
+        dx, dy = Actions.directionToVector(direction)
+        nextx, nexty = int(pos[0] + dx), int(pos[1] + dy)
+        if not problem.walls[nextx][nexty]:
+            bit = problem.survivorBits.get((nextx, nexty), 0)
+            nextMask = problem.maskType(mask & ~bit) if mask & bit else mask
+            stepCost = problem.startingMissionState.getTerrainCost(nextx, nexty)
+            successors.append((((nextx, nexty), nextMask), direction, stepCost))
+    return successors
+
+
+def timeCalls(fn, states, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for state in states:
+            fn(state)
+    elapsed = time.perf_counter() - start
+    return len(states) * repeats / elapsed
+
+
+def run(layoutName, repeats):
+    layout = rescue_layout.getLayout(layoutName)
+    if layout is None:
+        raise Exception("The layout " + layoutName + " cannot be found")
+    state = RescueState()
+    state.initialize(layout)
+
+    simple = SimpleSurvivorProblem(state, warn=False, visualize=False)
+    cells = simple.walls.asList(False)
+    compiled = timeCalls(simple.getSuccessors, cells, repeats)
+    adjacency, simple.adjacency = simple.adjacency, None
+    perCall = timeCalls(simple.getSuccessors, cells, repeats)
+    simple.adjacency = adjacency
+
+    multi = MultiSurvivorProblem(state)
+    mask = multi.getStartState()[1]
+    states = [(pos, mask) for pos in cells]
+    multiCompiled = timeCalls(multi.getSuccessors, states, repeats)
+    multiPerCall = timeCalls(lambda s: legacyMultiSuccessors(multi, s), states, repeats)
+
+    print("Layout %s: %d free cells, %d repeats" % (layoutName, len(cells), repeats))
+    for name, fast, slow in [
+        ("SimpleSurvivorProblem", compiled, perCall),
+        ("MultiSurvivorProblem", multiCompiled, multiPerCall),
+    ]:
+        print(
+            "%-22s %10.0f expansions/s compiled, %10.0f per call (%.1fx)"
+            % (name, fast, slow, fast / slow)
+        )
+
+
+if __name__ == "__main__":
+    parser = OptionParser(__doc__)
+    parser.add_option("-l", "--layout", dest="layout", default="bigCollapsedBuilding")
+    parser.add_option("-n", "--repeats", dest="repeats", type="int", default=20)
+    options, otherjunk = parser.parse_args(sys.argv[1:])
+    run(options.layout, options.repeats)
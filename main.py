@@ -1,4 +1,7 @@
 import world.rescue_layout as rescue_layout
+import algorithms.utils as utils
+import algorithms.landmarks as landmarks
+import ast
 import sys
 import time
 import pickle
@@ -26,6 +29,7 @@ def readCommand(argv):
     PROBLEM_CHOICES = (
         "SimpleSurvivorProblem",
         "MultiSurvivorProblem",
+        "MacroSurvivorProblem",
     )
     parser.add_option(
         "-p",
@@ -38,7 +42,7 @@ def readCommand(argv):
         "-f",
         "--function",
         dest="function",
-        help="Search function name (required). e.g. tinyHouseSearch, breadthFirstSearch, aStarSearch",
+        help="Search function name (required for SearchAgent). e.g. tinyHouseSearch, breadthFirstSearch, aStarSearch",
         metavar="FUNCTION",
     )
     parser.add_option(
@@ -49,6 +53,20 @@ def readCommand(argv):
         metavar="HEURISTIC",
         default="nullHeuristic",
     )
+    parser.add_option(
+        "-g",
+        "--agent",
+        dest="agent",
+        help=default("Agent class from algorithms/agents.py, e.g. SearchAgent, ReplanningAgent"),
+        metavar="AGENT",
+        default="SearchAgent",
+    )
+    parser.add_option(
+        "-a",
+        "--agentArgs",
+        dest="agentArgs",
+        help='Comma separated values sent to agent. e.g. "contract=True,opt2"',
+    )
     parser.add_option(
         "-l",
         "--layout",
@@ -96,6 +114,20 @@ def readCommand(argv):
         help=default("Time to delay between frames; <0 means keyboard"),
         default=0.1,
     )
+    parser.add_option(
+        "--heuristicCacheSize",
+        dest="heuristicCacheSize",
+        type="int",
+        help=default("Most entries kept in each heuristic cache (0 = unbounded)"),
+        default=utils.HEURISTIC_CACHE_SIZE,
+    )
+    parser.add_option(
+        "--landmarks",
+        dest="landmarks",
+        type="int",
+        help=default("Number of landmarks of the ALT heuristics"),
+        default=landmarks.LANDMARK_COUNT,
+    )
     parser.add_option(
         "-c",
         "--catchExceptions",
@@ -116,7 +148,7 @@ def readCommand(argv):
             "Invalid problem type '%s'. Choose one of: %s"
             % (options.problem, ", ".join(PROBLEM_CHOICES))
         )
-    if not options.function:
+    if not options.function and options.agent == "SearchAgent":
         parser.error("-f/--function is required")
     if not options.layout:
         parser.error("-l/--layout is required")
@@ -132,12 +164,18 @@ def readCommand(argv):
     print("Survivors:", args["layout"].survivors.asList())
     print("NumSurvivors:", len(args["layout"].survivors.asList()))
 
+    # Bound the heuristic caches of the search problems and size the landmark tables
+    utils.HEURISTIC_CACHE_SIZE = options.heuristicCacheSize
+    landmarks.LANDMARK_COUNT = options.landmarks
+
     # Choose a rescue agent
-    rescuerType = loadAgent("SearchAgent")
+    rescuerType = loadAgent(options.agent)
+    agentOpts = parseAgentArgs(options.agentArgs)
     rescuer = rescuerType(
         fn=options.function,
         prob=options.problem,
         heuristic=options.heuristic,
+        **agentOpts
     )
     args["rescuer"] = rescuer
 
@@ -168,6 +206,27 @@ def default(str_val):
     return str_val + " [Default: %default]"
 
 
+def parseAgentArgs(str_val):
+    """
+    Parses "key1=val1,key2,key3=val3" into a dict. Values that look like
+    Python literals (numbers, True/False) are converted; bare keys map to True.
+    """
+    if str_val is None:
+        return {}
+    opts = {}
+    for piece in str_val.split(","):
+        if "=" in piece:
+            key, val = piece.split("=", 1)
+            try:
+                val = ast.literal_eval(val)
+            except (ValueError, SyntaxError):
+                pass
+        else:
+            key, val = piece, True
+        opts[key] = val
+    return opts
+
+
 def loadAgent(rescuer):
     """
     Looks through algorithms/agents.py for the right agent.
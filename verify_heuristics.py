@@ -0,0 +1,109 @@
+"""
+Checks that a multi-survivor heuristic is admissible and consistent on the
+bundled layouts.
+
+For sampled states (random cell, random subset of survivors left):
+- admissible: h(s) <= h*(s), with h*(s) the exact optimum from Held-Karp
+  over the maze distances of that sub-instance
+- consistent: h(s) <= cost + h(s') for every successor s'
+- h is 0 on goal states
+
+USAGE:      python verify_heuristics.py [-H HEURISTIC] [-l LAYOUT] [-n SAMPLES]
+EXAMPLE:    python verify_heuristics.py -H survivorHeuristic -n 200
+"""
+import os
+import random
+import sys
+from optparse import OptionParser
+
+import world.rescue_layout as rescue_layout
+from algorithms import heuristics
+from algorithms.distances import SurvivorDistanceMatrix
+from algorithms.problems import MultiSurvivorProblem
+from algorithms.tours import heldKarpPath
+from world.rescue_state import RescueState
+
+EPSILON = 1e-9
+
+
+def layoutNames():
+    names = []
+    for root, _dirs, files in os.walk("layouts"):
+        names.extend(f[: -len(".lay")] for f in files if f.endswith(".lay"))
+    return sorted(names)
+
+
+def verifyLayout(name, heuristic, samples, maxLeft, rng):
+    """
+    Returns (states checked, admissibility violations, consistency
+    violations, mean h/h* over states with h* > 0).
+    """
+    state = RescueState()
+    state.initialize(rescue_layout.getLayout(name))
+    problem = MultiSurvivorProblem(state)
+    survivors = problem.survivorPositions
+    cells = problem.walls.asList(False)
+    start = problem.getStartState()
+
+    checked = admissibility = consistency = 0
+    ratios = []
+    if heuristic((start[0], problem.maskType(0)), problem) != 0:
+        admissibility += 1
+    for _ in range(samples):
+        pos = rng.choice(cells)
+        left = rng.sample(range(len(survivors)), rng.randint(1, min(maxLeft, len(survivors))))
+        mask = problem.maskType(sum(1 << i for i in left))
+        s = (pos, mask)
+        h = heuristic(s, problem)
+
+        # Exact cost to go: Held-Karp over the survivors left (those on pos are rescued already)
+        points = [pos] + [survivors[i] for i in left if survivors[i] != pos]
+        optimal, order = heldKarpPath(SurvivorDistanceMatrix(problem.adjacency, points).dist)
+        if h > optimal + EPSILON:
+            admissibility += 1
+            print("  not admissible at %s, %d left: h=%s h*=%s" % (pos, len(left), h, optimal))
+        if optimal > 0 and optimal < float("inf"):
+            ratios.append(h / optimal)
+
+        for succ, action, stepCost in problem.getSuccessors(s):
+            if h > stepCost + heuristic(succ, problem) + EPSILON:
+                consistency += 1
+                print("  not consistent at %s -> %s: h=%s, cost %s + h'=%s" % (
+                    pos, succ[0], h, stepCost, heuristic(succ, problem)))
+        checked += 1
+    mean = sum(ratios) / len(ratios) if ratios else 1.0
+    return checked, admissibility, consistency, mean
+
+
+def run(heuristicName, layouts, samples, maxLeft, seed):
+    heuristic = getattr(heuristics, heuristicName)
+    rng = random.Random(seed)
+    failures = 0
+    for name in layouts:
+        checked, admissibility, consistency, mean = verifyLayout(name, heuristic, samples, maxLeft, rng)
+        failures += admissibility + consistency
+        print(
+            "%-22s %4d states: %s, %s, mean h/h* %.3f"
+            % (
+                name,
+                checked,
+                "admissible" if admissibility == 0 else "%d admissibility violations" % admissibility,
+                "consistent" if consistency == 0 else "%d consistency violations" % consistency,
+                mean,
+            )
+        )
+    print("%s: %s" % (heuristicName, "OK" if failures == 0 else "%d violations" % failures))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = OptionParser(__doc__)
+    parser.add_option("-H", "--heuristic", dest="heuristic", default="survivorHeuristic")
+    parser.add_option("-l", "--layout", dest="layout", default=None, help="Only this layout")
+    parser.add_option("-n", "--samples", dest="samples", type="int", default=100)
+    parser.add_option("-k", "--maxLeft", dest="maxLeft", type="int", default=10,
+                      help="Most survivors left in a sampled state (Held-Karp size)")
+    parser.add_option("-s", "--seed", dest="seed", type="int", default=0)
+    options, otherjunk = parser.parse_args(sys.argv[1:])
+    layouts = [options.layout] if options.layout else layoutNames()
+    sys.exit(1 if run(options.heuristic, layouts, options.samples, options.maxLeft, options.seed) else 0)
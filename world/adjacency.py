@@ -0,0 +1,60 @@
+from world.game import MOVES, MOVE_VECTORS
+
+
+class LayoutAdjacency:
+    """
+    The move graph of a layout compiled into flat arrays (compressed rows).
+
+    Cell (x, y) has index x * height + y. The outgoing moves of cell i are
+    the entries offsets[i]:offsets[i + 1] of
+    - targets: index of the cell entered
+    - codes: index in MOVES of the move
+    - costs: terrain cost of the cell entered
+    edges holds the same moves as ready-made (nextPos, action, cost)
+    triples, so a problem's successors are a single slice.
+
+    Walls and cells outside the grid have no moves. Built once per layout
+    (see RescueLayout.getAdjacency).
+    """
+
+    def __init__(self, layout, walls=None):
+        """
+        layout: RescueLayout (terrain costs)
+        walls: Grid of walls to compile; default layout.walls
+        """
+        if walls is None:
+            walls = layout.walls
+        width, height = walls.width, walls.height
+        self.walls = walls
+        self.width, self.height = width, height
+        self.offsets = [0] * (width * height + 1)
+        self.targets = []
+        self.codes = []
+        self.costs = []
+        self.edges = []
+
+        for x in range(width):
+            for y in range(height):
+                if not walls[x][y]:
+                    for code, (dx, dy) in enumerate(MOVE_VECTORS):
+                        nextx, nexty = x + dx, y + dy
+                        if 0 <= nextx < width and 0 <= nexty < height and not walls[nextx][nexty]:
+                            cost = layout.getTerrainCost(nextx, nexty)
+                            self.targets.append(nextx * height + nexty)
+                            self.codes.append(code)
+                            self.costs.append(cost)
+                            self.edges.append(((nextx, nexty), MOVES[code], cost))
+                self.offsets[x * height + y + 1] = len(self.edges)
+
+    def index(self, pos):
+        return pos[0] * self.height + pos[1]
+
+    def position(self, i):
+        return divmod(i, self.height)
+
+    def successors(self, pos):
+        """
+        Returns the (nextPos, action, cost) moves out of pos.
+        """
+        i = pos[0] * self.height + pos[1]
+        return self.edges[self.offsets[i] : self.offsets[i + 1]]
@@ -41,6 +41,12 @@ class Directions:
     REVERSE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST, STOP: STOP}
 
 
+# The four moves out of a cell, in the order successors are generated, and
+# their (dx, dy) vectors. Move tables and neighbor loops all use these.
+MOVES = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+MOVE_VECTORS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
 class Configuration:
     """
     A Configuration holds the (x,y) coordinate of a character, along with its
@@ -369,6 +375,7 @@ class GameStateData:
             self.layout = prevState.layout
             self.cumulativeCost = prevState.cumulativeCost
             self.rescuedCount = prevState.rescuedCount
+            self.layoutChanges = prevState.layoutChanges
 
         self.survivorsSaved = None
         self._agentMoved = None
@@ -474,6 +481,7 @@ class GameStateData:
         self.layout = layout
         self.cumulativeCost = 0
         self.rescuedCount = 0
+        self.layoutChanges = ()  # Cells changed during the mission, oldest first
 
         self.agentStates = []
         for pos in layout.agentPositions:
@@ -0,0 +1,93 @@
+from world.game import MOVE_VECTORS
+
+
+def _freeNeighbors(walls, pos):
+    x, y = pos
+    neighbors = []
+    for dx, dy in MOVE_VECTORS:
+        nextx, nexty = x + dx, y + dy
+        if 0 <= nextx < walls.width and 0 <= nexty < walls.height and not walls[nextx][nexty]:
+            neighbors.append((nextx, nexty))
+    return neighbors
+
+
+class LayoutReduction:
+    """
+    Preprocessed static information about a RescueLayout.
+
+    Two passes shrink the part of the map a search can wander into:
+    1. Cells unreachable from the rescuer start are turned into walls
+    2. Dead ends (free cells with at most one free neighbor) that hold no
+       survivor and no start are filled, repeatedly, so whole dead-end
+       pockets disappear. No optimal route ever enters such a pocket
+
+    prunedWalls keeps the original coordinate frame so problems, heuristics
+    and the display can keep using game positions.
+    """
+
+    def __init__(self, layout, keep=()):
+        protected = set(layout.agentPositions) | set(layout.survivors.asList()) | set(keep)
+        walls = layout.walls.copy()
+        self._wallsBefore = layout.walls.copy()
+
+        # Pass 1: unreachable regions
+        self.unreachableRemoved = 0
+        if layout.agentPositions:
+            reachable = set(layout.agentPositions)
+            stack = list(layout.agentPositions)
+            while stack:
+                for nextPos in _freeNeighbors(walls, stack.pop()):
+                    if nextPos not in reachable:
+                        reachable.add(nextPos)
+                        stack.append(nextPos)
+            for x in range(walls.width):
+                for y in range(walls.height):
+                    if not walls[x][y] and (x, y) not in reachable:
+                        walls[x][y] = True
+                        self.unreachableRemoved += 1
+
+        # Pass 2: iterative dead-end filling
+        self.deadEndsRemoved = 0
+        stack = [
+            (x, y)
+            for x in range(walls.width)
+            for y in range(walls.height)
+            if not walls[x][y]
+        ]
+        while stack:
+            pos = stack.pop()
+            x, y = pos
+            if walls[x][y] or pos in protected:
+                continue
+            neighbors = _freeNeighbors(walls, pos)
+            if len(neighbors) <= 1:
+                walls[x][y] = True
+                self.deadEndsRemoved += 1
+                stack.extend(neighbors)
+
+        self.prunedWalls = walls
+        self.freeCells = len(walls.asList(False))
+
+    def repaired(self, layout, changes):
+        """
+        Returns this reduction for layout, a newer version where the cells in
+        changes were edited, or None if it has to be rebuilt. Terrain-only
+        edits keep every wall, so the reduction still holds as it is.
+        """
+        if any(layout.walls[x][y] != self._wallsBefore[x][y] for x, y in changes):
+            return None
+        return self
+
+    def isFree(self, pos):
+        """
+        Returns True if pos survived the reduction.
+        """
+        x, y = pos
+        return not self.prunedWalls[x][y]
+
+    def report(self):
+        return (
+            "Layout reduction: %d unreachable and %d dead-end cells removed, "
+            "%d free cells left"
+            % (self.unreachableRemoved, self.deadEndsRemoved, self.freeCells)
+        )
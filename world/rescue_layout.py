@@ -1,4 +1,7 @@
 from world.game import Grid
+from world.layout_reduction import LayoutReduction
+from world.adjacency import LayoutAdjacency
+import hashlib
 import os
 
 
@@ -18,6 +21,7 @@ class RescueLayout:
         self.processLayoutText(layoutText)
         self.layoutText = layoutText
         self.totalSurvivors = len(self.survivors.asList())
+        self._cache = {}  # Derived structures (reduction, graphs, tables)
 
     def isWall(self, pos):
         """
@@ -53,11 +57,110 @@ class RescueLayout:
         }
         return TERRAIN_COSTS.get(terrain_char, 1)
 
+    def setCell(self, x, y, layoutChar):
+        """
+        Changes the cell at (x, y) to a wall, floor or terrain character
+        (fire spreading, flooding, a collapsing corridor...). The layout text
+        is kept in sync so copies see the change, and structures cached for
+        the old text are dropped.
+        """
+        if layoutChar in ["S", "R"]:
+            raise Exception("Survivors and rescuers can't be placed with setCell")
+        row = self.height - 1 - y
+        line = self.layoutText[row]
+        self.layoutText = self.layoutText[:]
+        self.layoutText[row] = line[:x] + layoutChar + line[x + 1 :]
+        self.walls[x][y] = False
+        self.terrain.pop((x, y), None)
+        self.processLayoutChar(x, y, layoutChar)
+        oldCache, self._cache = self._cache, {}
+        self._inheritCache(oldCache, [(x, y)])
+
+    def diff(self, other):
+        """
+        Returns the list of (x, y) cells whose character differs between this
+        layout and other, or None if the two are not versions of the same
+        building (different sizes or rescuer/survivor placement).
+        """
+        if (self.width, self.height) != (other.width, other.height):
+            return None
+        if self.agentPositions != other.agentPositions or self.survivors != other.survivors:
+            return None
+        changes = []
+        maxY = self.height - 1
+        for row, (line, otherLine) in enumerate(zip(self.layoutText, other.layoutText)):
+            if line != otherLine:
+                for x, (char, otherChar) in enumerate(zip(line, otherLine)):
+                    if char != otherChar:
+                        changes.append((x, maxY - row))
+        return changes
+
+    def inheritCache(self, older):
+        """
+        Reuses the cached tables of older, a previous version of this
+        building (e.g. the same map with a new rubble cell). Tables that know
+        how to repair themselves for the changed cells are repaired, the
+        others are dropped and rebuilt on demand. Returns the changed cells,
+        or None if the layouts are unrelated.
+        """
+        changes = self.diff(older)
+        if changes is None:
+            return None
+        if not changes:
+            self._cache = older._cache
+        else:
+            self._inheritCache(older._cache, changes)
+        return changes
+
+    def _inheritCache(self, oldCache, changes):
+        for key, value in oldCache.items():
+            repaired = getattr(value, "repaired", None)
+            if repaired is None:
+                continue
+            value = repaired(self, changes)
+            if value is not None:
+                self._cache[key] = value
+
+    def fingerprint(self):
+        """
+        Returns a content hash of the layout text, used to key tables that
+        are persisted on disk for this building. Any edit (setCell) gives a
+        new fingerprint; diff() tells which cells differ between versions.
+        """
+        if "fingerprint" not in self._cache:
+            text = "\n".join(self.layoutText).encode("utf-8")
+            self._cache["fingerprint"] = hashlib.sha1(text).hexdigest()[:16]
+        return self._cache["fingerprint"]
+
+    def getReduction(self):
+        """
+        Returns the LayoutReduction of this layout (dead ends filled and
+        unreachable cells walled off, in the original coordinates). Computed
+        once and shared by every copy of the layout.
+        """
+        if "reduction" not in self._cache:
+            self._cache["reduction"] = LayoutReduction(self)
+        return self._cache["reduction"]
+
+    def getAdjacency(self, reduced=False):
+        """
+        Returns the LayoutAdjacency (compiled move graph with terrain costs)
+        of this layout, or of its reduced walls if reduced is True. Computed
+        once and shared by every copy of the layout.
+        """
+        key = ("adjacency", reduced)
+        if key not in self._cache:
+            walls = self.getReduction().prunedWalls if reduced else self.walls
+            self._cache[key] = LayoutAdjacency(self, walls)
+        return self._cache[key]
+
     def __str__(self):
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return RescueLayout(self.layoutText[:])
+        layout = RescueLayout(self.layoutText[:])
+        layout._cache = self._cache  # Same text, same derived structures
+        return layout
 
     def processLayoutText(self, layoutText):
         """
@@ -109,6 +109,32 @@ class RescueState:
         """
         return self.data.survivors.count()
 
+    def getLayout(self):
+        """
+        Returns the RescueLayout of the mission.
+        """
+        return self.data.layout
+
+    def setLayoutCell(self, x, y, layoutChar):
+        """
+        Changes a cell of the map during the mission (e.g. '*' when fire
+        spreads, '%' when a corridor collapses, ' ' when rubble is cleared).
+
+        The layout is copied first so earlier states keep their map, and the
+        cell is appended to the layout change history so agents can tell what
+        changed since they last looked.
+        """
+        self.data.layout = self.data.layout.deepCopy()
+        self.data.layout.setCell(x, y, layoutChar)
+        self.data.layoutChanges = self.data.layoutChanges + ((x, y),)
+
+    def getLayoutChanges(self):
+        """
+        Returns the tuple of (x, y) cells changed since the mission started,
+        oldest first.
+        """
+        return self.data.layoutChanges
+
     def getWalls(self):
         """
         Returns a Grid of boolean wall indicators.